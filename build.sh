@@ -4,5 +4,6 @@ set -o errexit
 
 pip install -r requirements.txt
 
-python manage.py collectstatic --no-input
-python manage.py migrate
\ No newline at end of file
+python manage.py migrate
+python manage.py build_images
+python manage.py collectstatic --no-input
\ No newline at end of file
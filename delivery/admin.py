@@ -5,10 +5,13 @@ from django.contrib.auth.models import Group
 from delivery.models import (
     Customer,
     FeedBack,
+    ImageAsset,
     Topping,
     Pizza,
     PizzaType,
-    Order, Receipt
+    Order,
+    OrderItem,
+    Receipt
 )
 
 
@@ -50,18 +53,31 @@ class ToppingAdmin(ModelAdmin):
 
 @admin.register(Pizza)
 class PizzaAdmin(ModelAdmin):
-    list_display = ("name", "price", "ingredients")
+    list_display = ("name", "price", "ingredients", "image")
+    list_select_related = ("image",)
     ordering = ("price",)
 
 
+@admin.register(ImageAsset)
+class ImageAssetAdmin(ModelAdmin):
+    list_display = ("path", "width", "height", "content_hash")
+    readonly_fields = ("content_hash", "width", "height", "placeholder")
+
+
 @admin.register(PizzaType)
 class PizzaTypeAdmin(ModelAdmin):
     list_display = ("type",)
 
 
+class OrderItemInline(admin.TabularInline):
+    model = OrderItem
+    extra = 0
+
+
 @admin.register(Order)
 class OrderAdmin(ModelAdmin):
     list_display = ("customer", "status")
+    inlines = (OrderItemInline,)
 
 
 admin.site.register(Receipt)
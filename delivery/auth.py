@@ -0,0 +1,68 @@
+import time
+
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+USER_CACHE_TIMEOUT = 60 * 15
+PERMISSIONS_VERSION_KEY = "auth:permissions:version"
+
+
+def get_permissions_version() -> int:
+    version = cache.get(PERMISSIONS_VERSION_KEY)
+    if version is None:
+        cache.add(PERMISSIONS_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(PERMISSIONS_VERSION_KEY)
+    return version
+
+
+def bump_permissions_version() -> None:
+    try:
+        cache.incr(PERMISSIONS_VERSION_KEY)
+    except ValueError:
+        cache.add(PERMISSIONS_VERSION_KEY, time.time_ns(), None)
+
+
+def user_cache_key(user_id) -> str:
+    return f"auth:user:{user_id}"
+
+
+def permissions_cache_key(user_id) -> str:
+    return f"auth:permissions:{get_permissions_version()}:{user_id}"
+
+
+def forget_user(user_id) -> None:
+    cache.delete_many(
+        [user_cache_key(user_id), permissions_cache_key(user_id)]
+    )
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super(CachedModelBackend, self).get_user(user_id)
+            if user is not None:
+                cache.set(key, user, USER_CACHE_TIMEOUT)
+        return user
+
+    def get_all_permissions(self, user_obj, obj=None) -> set:
+        if (
+            obj is not None
+            or not user_obj.is_active
+            or user_obj.is_anonymous
+            or hasattr(user_obj, "_perm_cache")
+        ):
+            return super(CachedModelBackend, self).get_all_permissions(
+                user_obj, obj
+            )
+        key = permissions_cache_key(user_obj.pk)
+        permissions = cache.get(key)
+        if permissions is None:
+            permissions = super(
+                CachedModelBackend, self
+            ).get_all_permissions(user_obj)
+            cache.set(key, permissions, USER_CACHE_TIMEOUT)
+        # ModelBackend.has_perm and later backends read this attribute.
+        user_obj._perm_cache = permissions
+        return permissions
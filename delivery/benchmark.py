@@ -0,0 +1,90 @@
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from delivery.checkout import checkout
+from delivery.views import add_pizza_to_order, change_quantity
+
+
+@contextmanager
+def benchmark_environment() -> Iterator[None]:
+    with override_settings(DEBUG=False, ALLOWED_HOSTS=["testserver"]):
+        with transaction.atomic():
+            yield
+            transaction.set_rollback(True)
+
+
+def benchmark_client(username: str = "benchmark") -> Client:
+    customer = get_user_model().objects.create_user(username=username)
+    client = Client()
+    client.force_login(customer)
+    return client
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = round(pct / 100 * (len(ordered) - 1))
+    return ordered[index]
+
+
+def measure(request: Callable, repeat: int) -> dict:
+    with CaptureQueriesContext(connection) as queries:
+        request()
+    query_count = len(queries)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        request()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "queries": query_count,
+        "p50_ms": percentile(timings, 50),
+        "p95_ms": percentile(timings, 95),
+        "p99_ms": percentile(timings, 99),
+    }
+
+
+def cart_write_load(customer, pizza_id: int, deadline: float) -> dict:
+    latencies, errors = [], {}
+
+    def write(operation: Callable, *args):
+        start = time.perf_counter()
+        try:
+            result = operation(*args)
+        except OperationalError as error:
+            errors[str(error)] = errors.get(str(error), 0) + 1
+            return None
+        latencies.append((time.perf_counter() - start) * 1000)
+        return result
+
+    iteration = 0
+    while time.time() < deadline:
+        iteration += 1
+        item = write(add_pizza_to_order, customer, pizza_id)
+        if item is not None:
+            write(change_quantity, customer, item.pk, 1)
+        if iteration % 5 == 0:
+            write(checkout, customer)
+    return {"latencies": latencies, "errors": errors}
+
+
+def summarize_writes(results: list, duration: float) -> dict:
+    latencies = [value for result in results for value in result["latencies"]]
+    errors = {}
+    for result in results:
+        for message, count in result["errors"].items():
+            errors[message] = errors.get(message, 0) + count
+    return {
+        "writes": len(latencies),
+        "errors": sum(errors.values()),
+        "error_messages": errors,
+        "writes_per_second": round(len(latencies) / duration, 2),
+        "p50_ms": round(percentile(latencies or [0], 50), 3),
+        "p95_ms": round(percentile(latencies or [0], 95), 3),
+        "p99_ms": round(percentile(latencies or [0], 99), 3),
+    }
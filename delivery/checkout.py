@@ -0,0 +1,43 @@
+from django.db import transaction
+
+from delivery.models import Customer, Order, Receipt, ReceiptLine
+
+
+def build_receipt_line(receipt: Receipt, item) -> ReceiptLine:
+    toppings = [
+        {"name": topping.name, "price": topping.price}
+        for topping in item.topping.all()
+    ]
+    return ReceiptLine(
+        receipt=receipt,
+        pizza_name=item.pizza.name,
+        price=item.price,
+        toppings=toppings,
+        topping_price=sum(topping["price"] for topping in toppings),
+        quantity=item.quantity,
+        price_with_toppings=item.price_with_toppings,
+    )
+
+
+def checkout(customer: Customer) -> Receipt:
+    with transaction.atomic():
+        order = Order.objects.select_for_update().filter(
+            customer=customer, status=False
+        ).first()
+        if order is None:
+            return None
+        items = order.items.select_related("pizza").prefetch_related(
+            "topping"
+        )
+        receipt = Receipt(customer_order=order)
+        lines = [build_receipt_line(receipt, item) for item in items]
+        receipt.total_price = sum(
+            line.price_with_toppings for line in lines
+        )
+        receipt.topping_total_price = sum(
+            line.topping_price for line in lines
+        )
+        receipt.save()
+        ReceiptLine.objects.bulk_create(lines)
+        Order.objects.filter(pk=order.pk).update(status=True)
+    return receipt
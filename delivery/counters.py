@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from delivery.models import FeedBack, Pizza, PizzaType, Topping
+
+COUNTER_QUERYSETS = {
+    "pizza_count": lambda: Pizza.objects.filter(is_custom_pizza=False),
+    "topping_count": lambda: Topping.objects.all(),
+    "feedback_count": lambda: FeedBack.objects.all(),
+    "pizza_type_count": lambda: PizzaType.objects.all(),
+}
+
+
+def counter_key(name: str) -> str:
+    return f"counters:{name}"
+
+
+def reconcile_counters() -> dict:
+    counters = {
+        name: queryset().count()
+        for name, queryset in COUNTER_QUERYSETS.items()
+    }
+    cache.set_many(
+        {counter_key(name): value for name, value in counters.items()},
+        # Increments stay in the worker that made them under LocMem, so
+        # each worker recounts once its counters expire.
+        settings.CACHE_VERSION_TIMEOUT,
+    )
+    return counters
+
+
+def get_counters() -> dict:
+    cached = cache.get_many([counter_key(name) for name in COUNTER_QUERYSETS])
+    if len(cached) < len(COUNTER_QUERYSETS):
+        return reconcile_counters()
+    return {name: cached[counter_key(name)] for name in COUNTER_QUERYSETS}
+
+
+def increment_counter(name: str, delta: int) -> None:
+    try:
+        cache.incr(counter_key(name), delta)
+    except ValueError:
+        pass
+
+
+def adjust_counter(name: str, delta: int) -> None:
+    # Rolled-back writes (bench seeding, failed saves) must not move the
+    # counters.
+    transaction.on_commit(lambda: increment_counter(name, delta))
@@ -0,0 +1,227 @@
+import os
+import threading
+import time
+from collections import deque
+
+from django.db.utils import OperationalError
+
+from delivery import metrics
+
+POOL_DEFAULTS = {
+    "MIN_SIZE": 0,
+    "MAX_SIZE": 10,
+    "MAX_LIFETIME": 30 * 60,
+    "TIMEOUT": 10,
+    "CHECK_IDLE": 30,
+}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+def check_connection(connection) -> None:
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+    finally:
+        cursor.close()
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        name: str,
+        min_size: int = POOL_DEFAULTS["MIN_SIZE"],
+        max_size: int = POOL_DEFAULTS["MAX_SIZE"],
+        max_lifetime: float = POOL_DEFAULTS["MAX_LIFETIME"],
+        timeout: float = POOL_DEFAULTS["TIMEOUT"],
+        check_idle: float = POOL_DEFAULTS["CHECK_IDLE"],
+        check=check_connection,
+    ) -> None:
+        self.name = name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.check_idle = check_idle
+        self.check = check
+        self.condition = threading.Condition()
+        self.idle = deque()
+        self.created = {}
+        self.size = 0
+
+    def acquire(self, connect):
+        start = time.monotonic()
+        while True:
+            connection, released_at = self.checkout(start)
+            if connection is None:
+                connection = self.open(connect)
+                break
+            reason = self.problem(connection, released_at)
+            if reason is None:
+                break
+            self.discard(connection, reason)
+        metrics.observe(
+            "db_pool_wait_seconds", time.monotonic() - start, pool=self.name
+        )
+        self.fill(connect)
+        self.report()
+        return connection
+
+    def checkout(self, start: float) -> tuple:
+        deadline = start + self.timeout
+        with self.condition:
+            while True:
+                if self.idle:
+                    return self.idle.pop()
+                if self.size < self.max_size:
+                    self.size += 1
+                    return None, None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    metrics.increment("db_pool_timeouts_total", pool=self.name)
+                    raise PoolTimeout(
+                        f"No connection available in pool {self.name!r} "
+                        f"after {self.timeout}s (max size {self.max_size})"
+                    )
+                self.condition.wait(remaining)
+
+    def open(self, connect):
+        try:
+            connection = connect()
+        except Exception:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.created[id(connection)] = time.monotonic()
+        metrics.increment("db_pool_connections_created_total", pool=self.name)
+        return connection
+
+    def fill(self, connect) -> None:
+        while True:
+            with self.condition:
+                if self.size >= self.min_size:
+                    return
+                self.size += 1
+            connection = self.open(connect)
+            with self.condition:
+                self.idle.appendleft((connection, time.monotonic()))
+                self.condition.notify()
+
+    def expired(self, connection) -> bool:
+        created = self.created.get(id(connection), 0)
+        return time.monotonic() - created >= self.max_lifetime
+
+    def problem(self, connection, released_at: float) -> str:
+        if self.expired(connection):
+            return "expired"
+        if time.monotonic() - released_at >= self.check_idle:
+            try:
+                self.check(connection)
+            except Exception:
+                return "failed_check"
+        return None
+
+    def release(self, connection, broken: bool = False) -> None:
+        reason = "broken" if broken else None
+        if reason is None and self.expired(connection):
+            reason = "expired"
+        if reason is None:
+            try:
+                connection.rollback()
+            except Exception:
+                reason = "failed_reset"
+        if reason is not None:
+            self.discard(connection, reason)
+            return
+        with self.condition:
+            self.idle.append((connection, time.monotonic()))
+            self.condition.notify()
+        self.report()
+
+    def discard(self, connection, reason: str) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self.condition:
+            self.created.pop(id(connection), None)
+            self.size -= 1
+            self.condition.notify()
+        metrics.increment(
+            "db_pool_discarded_total", pool=self.name, reason=reason
+        )
+        self.report()
+
+    def close(self) -> None:
+        with self.condition:
+            idle, self.idle = list(self.idle), deque()
+        for connection, _ in idle:
+            self.discard(connection, "closed")
+
+    def report(self) -> None:
+        with self.condition:
+            size, idle = self.size, len(self.idle)
+        metrics.set_gauge("db_pool_size", size, pool=self.name)
+        metrics.set_gauge("db_pool_idle", idle, pool=self.name)
+
+
+def pool_key(alias: str, settings_dict: dict) -> tuple:
+    return (
+        os.getpid(),
+        alias,
+        settings_dict["NAME"],
+        settings_dict["HOST"],
+        settings_dict["PORT"],
+        settings_dict["USER"],
+    )
+
+
+def get_pool(alias: str, settings_dict: dict) -> ConnectionPool:
+    # Keyed by pid so forked workers never share their parent's sockets.
+    key = pool_key(alias, settings_dict)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            options = dict(POOL_DEFAULTS, **settings_dict.get("POOL", {}))
+            pool = _pools[key] = ConnectionPool(
+                alias,
+                min_size=options["MIN_SIZE"],
+                max_size=options["MAX_SIZE"],
+                max_lifetime=options["MAX_LIFETIME"],
+                timeout=options["TIMEOUT"],
+                check_idle=options["CHECK_IDLE"],
+            )
+    return pool
+
+
+class PooledDatabaseWrapperMixin:
+    @property
+    def pool(self) -> ConnectionPool:
+        return get_pool(self.alias, self.settings_dict)
+
+    def get_new_connection(self, conn_params: dict):
+        connect = super(PooledDatabaseWrapperMixin, self).get_new_connection
+        connection = self.pool.acquire(lambda: connect(conn_params))
+        self.prepare_connection(connection)
+        return connection
+
+    def prepare_connection(self, connection) -> None:
+        pass
+
+    def _close(self) -> None:
+        if self.connection is None:
+            return
+        # A connection closed inside atomic() stays referenced by this
+        # wrapper until the block exits, so it can't go back to the pool.
+        broken = self.in_atomic_block or (
+            self.errors_occurred and not self.is_usable()
+        )
+        with self.wrap_database_errors:
+            self.pool.release(self.connection, broken=broken)
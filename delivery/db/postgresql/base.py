@@ -0,0 +1,10 @@
+from django.db.backends.postgresql import base
+
+from delivery.db.pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    def prepare_connection(self, connection) -> None:
+        self.isolation_level = self.settings_dict["OPTIONS"].get(
+            "isolation_level", connection.isolation_level
+        )
@@ -0,0 +1,83 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Read-only views whose queries may go to a replica. Everything else, and
+# any request from a client pinned to the primary, reads from the primary.
+REPLICA_VIEWS = {
+    "delivery:pizza-menu-list",
+    "delivery:pizza-menu-type-list",
+    "delivery:topping-list",
+    "delivery:feedback-list",
+    "delivery:receipt-list",
+}
+PIN_COOKIE_NAME = "db_primary"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+# One mutable dict per request: sync_to_async copies the context, so the
+# router and middleware share state through the dict, not the variable.
+_routing = ContextVar("replica_routing", default=None)
+
+
+def replica_view(view: str) -> bool:
+    return view in REPLICA_VIEWS or (
+        view.startswith("admin:") and view.endswith("_changelist")
+    )
+
+
+def start_request() -> tuple:
+    state = {"replica": None, "wrote": False}
+    return state, _routing.set(state)
+
+
+def end_request(token) -> None:
+    _routing.reset(token)
+
+
+def use_replica() -> None:
+    state = _routing.get()
+    if state is not None and settings.DATABASE_REPLICAS:
+        state["replica"] = random.choice(settings.DATABASE_REPLICAS)
+
+
+@contextmanager
+def read_from_primary() -> Iterator[None]:
+    state = _routing.get()
+    replica = state and state["replica"]
+    if state is not None:
+        state["replica"] = None
+    try:
+        yield
+    finally:
+        if state is not None:
+            state["replica"] = replica
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints) -> str:
+        state = _routing.get()
+        return state and state["replica"]
+
+    def db_for_write(self, model, **hints) -> str:
+        # Rows read from a replica must still be saved to the primary, and
+        # the rest of the request reads its own writes.
+        state = _routing.get()
+        if state is not None:
+            state["replica"] = None
+            state["wrote"] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, **hints) -> bool:
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,33 @@
+from django.db.backends.sqlite3 import base
+
+from delivery.db.pool import PooledDatabaseWrapperMixin
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "cache_size": -20000,
+    "mmap_size": 128 * 1024 * 1024,
+}
+
+
+class TunedDatabaseWrapper(base.DatabaseWrapper):
+    def get_new_connection(self, conn_params: dict):
+        connection = super(TunedDatabaseWrapper, self).get_new_connection(
+            conn_params
+        )
+        pragmas = dict(SQLITE_PRAGMAS, **self.settings_dict.get("PRAGMAS", {}))
+        for name, value in pragmas.items():
+            connection.execute(f"PRAGMA {name} = {value}")
+        return connection
+
+    def _start_transaction_under_autocommit(self) -> None:
+        # A deferred BEGIN takes the write lock at the first write, and
+        # SQLite fails that upgrade at once with "database is locked" when
+        # another connection is writing. IMMEDIATE waits on busy_timeout.
+        mode = self.settings_dict.get("TRANSACTION_MODE", "IMMEDIATE")
+        self.cursor().execute(f"BEGIN {mode}")
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, TunedDatabaseWrapper):
+    pass
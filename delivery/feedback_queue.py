@@ -0,0 +1,162 @@
+import atexit
+import fcntl
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from delivery import metrics
+from delivery.counters import adjust_counter
+from delivery.models import FeedBack
+
+SPILL_PATTERN = "feedback-*.jsonl"
+
+_buffer = None
+
+
+def save_entries(entries: list) -> int:
+    feedback = [
+        FeedBack(
+            customer_id=entry["customer_id"],
+            comment=entry["comment"],
+            created_time=parse_datetime(entry["created_time"]),
+        )
+        for entry in entries
+    ]
+    try:
+        with transaction.atomic():
+            FeedBack.objects.bulk_create(feedback)
+        saved = len(feedback)
+    except IntegrityError:
+        saved = 0
+        for row in feedback:
+            try:
+                with transaction.atomic():
+                    row.save()
+                saved += 1
+            except IntegrityError:
+                metrics.increment("feedback_dropped_total")
+    adjust_counter("feedback_count", saved)
+    return saved
+
+
+def read_spill_file(spill) -> list:
+    entries = []
+    for line in spill:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue
+    return entries
+
+
+def recover_spill_files(spill_dir: Path) -> int:
+    saved = 0
+    for path in sorted(Path(spill_dir).glob(SPILL_PATTERN)):
+        with open(path, "r+") as spill:
+            try:
+                fcntl.flock(spill, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue
+            saved += save_entries(read_spill_file(spill))
+            path.unlink()
+    return saved
+
+
+class FeedbackBuffer:
+    def __init__(
+        self,
+        size: int = None,
+        interval: float = None,
+        spill_dir: Path = None,
+    ) -> None:
+        self.size = size or settings.FEEDBACK_BUFFER_SIZE
+        self.interval = interval or settings.FEEDBACK_FLUSH_INTERVAL
+        self.spill_dir = Path(spill_dir or settings.FEEDBACK_SPILL_DIR)
+        self.entries = []
+        self.lock = threading.Lock()
+        self.timer = None
+        self.spill = None
+        self.spill_pid = None
+
+    def open_spill(self):
+        if self.spill is None or self.spill_pid != os.getpid():
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            self.spill_pid = os.getpid()
+            # Container pids repeat across restarts; a reused name would
+            # truncate a dead worker's unrecovered entries on first flush.
+            path = (
+                self.spill_dir
+                / f"feedback-{self.spill_pid}-{uuid.uuid4().hex}.jsonl"
+            )
+            self.spill = open(path, "x")
+            fcntl.flock(self.spill, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return self.spill
+
+    def add(self, customer_id: int, comment: str) -> None:
+        entry = {
+            "customer_id": customer_id,
+            "comment": comment,
+            "created_time": timezone.now().isoformat(),
+        }
+        with self.lock:
+            spill = self.open_spill()
+            spill.write(json.dumps(entry) + "\n")
+            spill.flush()
+            self.entries.append(entry)
+            metrics.set_gauge("feedback_queue_depth", len(self.entries))
+            if len(self.entries) >= self.size:
+                self._flush()
+            elif self.timer is None:
+                self.schedule()
+
+    def schedule(self) -> None:
+        self.timer = threading.Timer(self.interval, self.flush_from_timer)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def flush(self) -> int:
+        with self.lock:
+            return self._flush()
+
+    def flush_from_timer(self) -> None:
+        try:
+            self.flush()
+        finally:
+            connections.close_all()
+
+    def _flush(self) -> int:
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.entries:
+            return 0
+        start = time.perf_counter()
+        try:
+            saved = save_entries(self.entries)
+        except DatabaseError:
+            metrics.increment("feedback_flush_errors_total")
+            self.schedule()
+            return 0
+        self.entries = []
+        # "x" mode writes at the file position, not the end of the file.
+        self.spill.seek(0)
+        self.spill.truncate()
+        metrics.observe("feedback_flush_seconds", time.perf_counter() - start)
+        metrics.set_gauge("feedback_queue_depth", 0)
+        return saved
+
+
+def get_feedback_buffer() -> FeedbackBuffer:
+    global _buffer
+    if _buffer is None:
+        _buffer = FeedbackBuffer()
+        atexit.register(_buffer.flush)
+    return _buffer
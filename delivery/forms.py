@@ -6,7 +6,7 @@ from delivery.models import (
     Customer,
     FeedBack,
     Topping,
-    Pizza
+    OrderItem
 )
 
 
@@ -39,7 +39,13 @@ class ToppingSearchForm(forms.Form):
         max_length=63,
         required=False,
         label="",
-        widget=forms.TextInput(attrs={"placeholder": "Search for name..."})
+        widget=forms.TextInput(
+            attrs={
+                "placeholder": "Search for name...",
+                "list": "search-suggestions",
+                "autocomplete": "off",
+            }
+        )
     )
 
 
@@ -49,7 +55,7 @@ class FeedBackCreateForm(forms.ModelForm):
         fields = ["comment"]
 
 
-class PizzaForm(forms.ModelForm):
+class OrderItemForm(forms.ModelForm):
     topping = forms.ModelMultipleChoiceField(
         queryset=Topping.objects.all(),
         widget=forms.CheckboxSelectMultiple,
@@ -57,7 +63,7 @@ class PizzaForm(forms.ModelForm):
     )
 
     class Meta:
-        model = Pizza
+        model = OrderItem
         fields = ("topping",)
 
 
@@ -0,0 +1,191 @@
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.utils.text import slugify
+
+from delivery.models import ImageAsset, Pizza
+
+SOURCE_SUFFIXES = (".png", ".jpg", ".jpeg")
+IMAGE_FORMATS = {"avif": "AVIF", "webp": "WEBP"}
+MANIFEST_VERSION = 2
+
+
+def source_images(source_dir: Path) -> list:
+    return sorted(
+        path
+        for path in Path(source_dir).rglob("*")
+        if path.suffix.lower() in SOURCE_SUFFIXES
+        and Path(settings.IMAGE_OUTPUT_DIR) not in path.parents
+    )
+
+
+def file_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def supported_formats() -> dict:
+    from PIL import Image
+
+    Image.init()
+    return {
+        extension: name
+        for extension, name in IMAGE_FORMATS.items()
+        if name in Image.SAVE
+    }
+
+
+def output_stem(source: Path, source_dir: Path) -> Path:
+    relative = source.relative_to(source_dir).with_suffix("")
+    return Path(*(slugify(part) for part in relative.parts))
+
+
+def dominant_color(image) -> str:
+    red, green, blue = image.convert("RGB").resize((1, 1)).getpixel((0, 0))
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def write_hashed(path: Path, data: bytes) -> Path:
+    hashed = path.with_name(f"{path.stem}.{file_hash(data)}{path.suffix}")
+    hashed.parent.mkdir(parents=True, exist_ok=True)
+    hashed.write_bytes(data)
+    return hashed
+
+
+def variant_widths(width: int, widths: tuple) -> list:
+    return [w for w in widths if w < width] + [min(width, max(widths))]
+
+
+def build_variants(
+    source: Path, source_dir: Path, output_dir: Path, formats: dict
+) -> dict:
+    from PIL import Image
+
+    stem = output_stem(source, source_dir)
+    for stale in (output_dir / stem).parent.glob(f"{stem.name}.*"):
+        stale.unlink()
+    for stale in (output_dir / stem).parent.glob(f"{stem.name}-[0-9]*w.*"):
+        stale.unlink()
+    data = source.read_bytes()
+    fallback = write_hashed(
+        output_dir / stem.with_suffix(source.suffix.lower()), data
+    )
+    with Image.open(source) as image:
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        width, height = image.size
+        entry = {
+            "version": MANIFEST_VERSION,
+            "source_hash": file_hash(data),
+            "fallback": static_path(fallback),
+            "width": width,
+            "height": height,
+            "placeholder": dominant_color(image),
+            "variants": {},
+        }
+        for extension, image_format in formats.items():
+            variants = []
+            for target in variant_widths(width, settings.IMAGE_WIDTHS):
+                resized = image.copy()
+                resized.thumbnail((target, height))
+                path = output_dir / f"{stem}-{target}w.{extension}"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                resized.save(
+                    path, image_format, quality=settings.IMAGE_QUALITY
+                )
+                hashed = write_hashed(path, path.read_bytes())
+                path.unlink()
+                variants.append(
+                    {"path": static_path(hashed), "width": resized.width}
+                )
+            entry["variants"][extension] = variants
+    return entry
+
+
+def static_path(path: Path) -> str:
+    for static_dir in settings.STATICFILES_DIRS:
+        try:
+            return Path(path).relative_to(static_dir).as_posix()
+        except ValueError:
+            continue
+    raise ValueError(f"{path} is not inside STATICFILES_DIRS")
+
+
+def read_manifest(path: Path) -> dict:
+    try:
+        return json.loads(Path(path).read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+@lru_cache(maxsize=1)
+def _cached_manifest(path: str, mtime: float) -> dict:
+    return read_manifest(path)
+
+
+def get_manifest() -> dict:
+    path = Path(settings.IMAGE_MANIFEST)
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return {}
+    return _cached_manifest(str(path), mtime)
+
+
+def is_current(entry: dict, source: Path) -> bool:
+    if not entry or entry.get("version") != MANIFEST_VERSION:
+        return False
+    if entry["source_hash"] != file_hash(source.read_bytes()):
+        return False
+    paths = [entry["fallback"]] + [
+        variant["path"]
+        for variants in entry["variants"].values()
+        for variant in variants
+    ]
+    return all(finders.find(path) is not None for path in paths)
+
+
+def remove_outputs(entry: dict) -> None:
+    if not entry:
+        return
+    paths = [entry.get("fallback")] + [
+        variant["path"]
+        for variants in entry.get("variants", {}).values()
+        for variant in variants
+    ]
+    output_dir = Path(settings.IMAGE_OUTPUT_DIR)
+    for path in filter(None, map(finders.find, filter(None, paths))):
+        if output_dir in Path(path).parents:
+            Path(path).unlink()
+
+
+def sync_assets(manifest: dict) -> int:
+    existing = ImageAsset.objects.in_bulk(manifest, field_name="path")
+    changed = []
+    for name, entry in manifest.items():
+        asset = existing.get(name) or ImageAsset(path=name)
+        fields = {
+            "content_hash": entry["source_hash"],
+            "width": entry["width"],
+            "height": entry["height"],
+            "placeholder": entry["placeholder"],
+        }
+        if asset.pk and all(
+            getattr(asset, field) == value for field, value in fields.items()
+        ):
+            continue
+        for field, value in fields.items():
+            setattr(asset, field, value)
+        asset.save()
+        existing[name] = asset
+        changed.append(asset)
+
+    for pizza in Pizza.objects.filter(image__isnull=True):
+        asset = existing.get(f"pizzas/{pizza.name}.png")
+        if asset is not None:
+            pizza.image = asset
+            pizza.save(update_fields=["image"])
+    return len(changed)
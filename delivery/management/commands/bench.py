@@ -0,0 +1,274 @@
+import json
+import platform
+import random
+import time
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from delivery.benchmark import benchmark_environment, percentile
+from delivery.middleware import QueryRecorder
+from delivery.models import (
+    FeedBack,
+    Order,
+    OrderItem,
+    Pizza,
+    PizzaType,
+    Receipt,
+    ReceiptLine,
+    Topping,
+)
+
+FUNNEL_STEPS = (
+    "menu",
+    "add_pizza",
+    "add_toppings",
+    "increment",
+    "checkout",
+    "receipt",
+)
+
+
+def cycle_rows(rows: list, count: int) -> list:
+    return [rows[i % len(rows)] for i in range(count)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a dataset and drive the ordering funnel (menu, add pizza, "
+        "add toppings, increment, checkout, receipt) through the real "
+        "URLconf. Prints a JSON report; all seeded rows are rolled back."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--customers", type=int, default=20)
+        parser.add_argument("--pizzas", type=int, default=50)
+        parser.add_argument("--toppings", type=int, default=30)
+        parser.add_argument(
+            "--orders",
+            type=int,
+            default=500,
+            help="Closed orders with receipts to seed as history.",
+        )
+        parser.add_argument("--feedback", type=int, default=1000)
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=50,
+            help="Complete funnels to run.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--catalog",
+            default=settings.BASE_DIR / "data_delivery_pizza.json",
+            help="Fixture the pizza types, pizzas and toppings come from.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the JSON report to this file instead of stdout.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        self.random = random.Random(options["seed"])
+        with benchmark_environment():
+            self.seed(options)
+            clients = self.login_clients()
+            samples = {step: [] for step in FUNNEL_STEPS}
+            start = time.perf_counter()
+            for _ in range(options["iterations"]):
+                self.run_funnel(self.random.choice(clients), samples)
+            duration = time.perf_counter() - start
+        report = self.build_report(options, samples, duration)
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            Path(options["output"]).write_text(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def seed(self, options: dict) -> None:
+        catalog = json.loads(Path(options["catalog"]).read_text())
+        rows = {}
+        for row in catalog:
+            rows.setdefault(row["model"], []).append(row["fields"])
+
+        pizza_types = PizzaType.objects.bulk_create(
+            PizzaType(type=f"{fields['type']} (bench)")
+            for fields in rows["delivery.pizzatype"]
+        )
+        self.pizzas = Pizza.objects.bulk_create(
+            Pizza(
+                name=f"{fields['name']} #{i}",
+                price=fields["price"],
+                ingredients=fields["ingredients"],
+                type_pizza=pizza_types[i % len(pizza_types)],
+            )
+            for i, fields in enumerate(
+                cycle_rows(rows["delivery.pizza"], options["pizzas"])
+            )
+        )
+        self.toppings = Topping.objects.bulk_create(
+            Topping(name=f"{fields['name']} #{i}", price=fields["price"])
+            for i, fields in enumerate(
+                cycle_rows(rows["delivery.topping"], options["toppings"])
+            )
+        )
+        self.customers = get_user_model().objects.bulk_create(
+            get_user_model()(username=f"bench-customer-{i}")
+            for i in range(options["customers"])
+        )
+        self.seed_history(options["orders"])
+        FeedBack.objects.bulk_create(
+            FeedBack(
+                comment=f"Feedback {i}",
+                customer=self.random.choice(self.customers),
+            )
+            for i in range(options["feedback"])
+        )
+
+    def seed_history(self, count: int) -> None:
+        orders = Order.objects.bulk_create(
+            Order(customer=self.random.choice(self.customers), status=True)
+            for _ in range(count)
+        )
+        pizzas = [self.random.choice(self.pizzas) for _ in orders]
+        OrderItem.objects.bulk_create(
+            OrderItem(
+                order=order,
+                pizza=pizza,
+                price=pizza.price,
+                price_with_toppings=pizza.price,
+            )
+            for order, pizza in zip(orders, pizzas)
+        )
+        receipts = Receipt.objects.bulk_create(
+            Receipt(customer_order=order, total_price=pizza.price)
+            for order, pizza in zip(orders, pizzas)
+        )
+        ReceiptLine.objects.bulk_create(
+            ReceiptLine(
+                receipt=receipt,
+                pizza_name=pizza.name,
+                price=pizza.price,
+                price_with_toppings=pizza.price,
+            )
+            for receipt, pizza in zip(receipts, pizzas)
+        )
+
+    def login_clients(self) -> list:
+        clients = []
+        for customer in self.customers:
+            client = Client()
+            client.force_login(customer)
+            client.customer = customer
+            clients.append(client)
+        return clients
+
+    def request(self, samples: dict, step: str, method, *args, **kwargs):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = method(*args, **kwargs)
+        samples[step].append(
+            {
+                "ms": (time.perf_counter() - start) * 1000,
+                "queries": recorder.count,
+                "status": response.status_code,
+            }
+        )
+        return response
+
+    def run_funnel(self, client: Client, samples: dict) -> None:
+        pizza = self.random.choice(self.pizzas)
+        toppings = self.random.sample(
+            self.toppings, min(2, len(self.toppings))
+        )
+        self.request(
+            samples, "menu", client.get, reverse("delivery:pizza-menu-list")
+        )
+        self.request(
+            samples,
+            "add_pizza",
+            client.post,
+            reverse("delivery:order-add-pizza", args=[pizza.id]),
+        )
+        item = OrderItem.objects.filter(
+            order__customer=client.customer, order__status=False
+        ).latest("id")
+        self.request(
+            samples,
+            "add_toppings",
+            client.post,
+            reverse("delivery:choose-topping", args=[item.id]),
+            {"topping": [topping.id for topping in toppings]},
+        )
+        self.request(
+            samples,
+            "increment",
+            client.post,
+            reverse("delivery:order-increment", args=[item.id]),
+        )
+        self.request(
+            samples,
+            "checkout",
+            client.post,
+            reverse("delivery:receipt-create"),
+        )
+        self.request(
+            samples, "receipt", client.get, reverse("delivery:receipt-list")
+        )
+
+    @staticmethod
+    def summarize(step_samples: list) -> dict:
+        timings = [sample["ms"] for sample in step_samples]
+        queries = [sample["queries"] for sample in step_samples]
+        statuses = {}
+        for sample in step_samples:
+            status = str(sample["status"])
+            statuses[status] = statuses.get(status, 0) + 1
+        return {
+            "requests": len(step_samples),
+            "p50_ms": round(percentile(timings, 50), 3),
+            "p95_ms": round(percentile(timings, 95), 3),
+            "p99_ms": round(percentile(timings, 99), 3),
+            "queries_mean": round(sum(queries) / len(queries), 2),
+            "queries_max": max(queries),
+            "status": statuses,
+        }
+
+    def build_report(
+        self, options: dict, samples: dict, duration: float
+    ) -> dict:
+        requests = sum(len(step_samples) for step_samples in samples.values())
+        return {
+            "created": timezone.now().isoformat(),
+            "environment": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+            },
+            "dataset": {
+                name: options[name]
+                for name in (
+                    "customers",
+                    "pizzas",
+                    "toppings",
+                    "orders",
+                    "feedback",
+                    "seed",
+                )
+            },
+            "iterations": options["iterations"],
+            "duration_s": round(duration, 3),
+            "throughput_rps": round(requests / duration, 2),
+            "funnels_per_s": round(options["iterations"] / duration, 2),
+            "steps": {
+                step: self.summarize(samples[step]) for step in FUNNEL_STEPS
+            },
+        }
@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.urls import reverse
+
+from delivery.benchmark import (
+    benchmark_client,
+    benchmark_environment,
+    measure,
+)
+from delivery.models import Pizza, PizzaType
+
+DUMMY_CACHE_BACKEND = "django.core.cache.backends.dummy.DummyCache"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure menu page latency while the number of custom pizza rows "
+        "grows. All seeded rows are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[1000, 10000, 100000, 1000000],
+            help="Numbers of custom pizza rows to measure at.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Requests per measurement.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Rows inserted per bulk_create call.",
+        )
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Disable the menu cache to measure the database path.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        caches = settings.CACHES
+        if options["no_cache"]:
+            caches = {"default": {"BACKEND": DUMMY_CACHE_BACKEND}}
+        with override_settings(CACHES=caches), benchmark_environment():
+            pizza_type = PizzaType.objects.create(type="Benchmark")
+            Pizza.objects.bulk_create(
+                Pizza(name=f"Pizza {i}", type_pizza=pizza_type, price=10)
+                for i in range(12)
+            )
+            client = benchmark_client()
+            url = reverse("delivery:pizza-menu-list")
+            custom_rows = 0
+            for size in sorted(options["sizes"]):
+                self.seed_custom_pizzas(
+                    pizza_type, custom_rows, size, options["batch_size"]
+                )
+                custom_rows = size
+                result = measure(lambda: client.get(url), options["repeat"])
+                self.stdout.write(
+                    f"{size:>9} custom rows: "
+                    f"p50 {result['p50_ms']:.2f} ms, "
+                    f"p95 {result['p95_ms']:.2f} ms, "
+                    f"{result['queries']} queries"
+                )
+
+    @staticmethod
+    def seed_custom_pizzas(
+        pizza_type: PizzaType, start: int, stop: int, batch_size: int
+    ) -> None:
+        for batch_start in range(start, stop, batch_size):
+            batch_stop = min(batch_start + batch_size, stop)
+            Pizza.objects.bulk_create(
+                Pizza(
+                    name=f"Pizza {i % 12}",
+                    type_pizza=pizza_type,
+                    price=10,
+                    is_custom_pizza=True,
+                )
+                for i in range(batch_start, batch_stop)
+            )
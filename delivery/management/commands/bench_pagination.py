@@ -0,0 +1,82 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+
+from delivery.benchmark import benchmark_environment, measure
+from delivery.models import FeedBack
+from delivery.pagination import KeysetPaginator
+from delivery.views import FeedBackListView
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare OFFSET and keyset pagination of the feedback list on the "
+        "first, middle and last page. All seeded rows are rolled back "
+        "afterwards."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=1000000,
+            help="Number of feedback rows to seed.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Page fetches per measurement.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Rows inserted per bulk_create call.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        with benchmark_environment():
+            customer = get_user_model().objects.create_user(
+                username="benchmark"
+            )
+            self.seed_feedback(
+                customer, options["rows"], options["batch_size"]
+            )
+            queryset = FeedBackListView.queryset
+            per_page = FeedBackListView.paginate_by
+            ordering = FeedBackListView.keyset_ordering
+            offset_paginator = Paginator(
+                queryset.order_by(*ordering), per_page
+            )
+            keyset_paginator = KeysetPaginator(queryset, per_page, ordering)
+            last_page = offset_paginator.num_pages
+            for number in sorted({1, (last_page + 1) // 2, last_page}):
+                cursor = None
+                if number > 1:
+                    previous = offset_paginator.page(number - 1)
+                    cursor = keyset_paginator.encode_cursor(previous[-1])
+                offset = measure(
+                    lambda: list(offset_paginator.page(number)),
+                    options["repeat"],
+                )
+                keyset = measure(
+                    lambda: list(keyset_paginator.page(cursor)),
+                    options["repeat"],
+                )
+                self.stdout.write(
+                    f"page {number:>9}: "
+                    f"offset p50 {offset['p50_ms']:.2f} ms, "
+                    f"p95 {offset['p95_ms']:.2f} ms; "
+                    f"keyset p50 {keyset['p50_ms']:.2f} ms, "
+                    f"p95 {keyset['p95_ms']:.2f} ms"
+                )
+
+    @staticmethod
+    def seed_feedback(customer, rows: int, batch_size: int) -> None:
+        for batch_start in range(0, rows, batch_size):
+            batch_stop = min(batch_start + batch_size, rows)
+            FeedBack.objects.bulk_create(
+                FeedBack(comment=f"Feedback {i}", customer=customer)
+                for i in range(batch_start, batch_stop)
+            )
@@ -0,0 +1,98 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from delivery.benchmark import benchmark_environment, measure
+from delivery.models import Topping
+from delivery.search import bump_search_version, get_index, search
+
+WORDS = [
+    "mozzarella",
+    "pepperoni",
+    "mushroom",
+    "olive",
+    "basil",
+    "jalapeno",
+    "pineapple",
+    "anchovy",
+    "onion",
+    "bacon",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the topping search index against an icontains scan as "
+        "the number of toppings grows. All seeded rows are rolled back "
+        "afterwards."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10000, 1000000],
+            help="Numbers of topping rows to measure at.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Searches per measurement.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Rows inserted per bulk_create call.",
+        )
+        parser.add_argument(
+            "--term",
+            default="pepper",
+            help="Search term to measure.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        term = options["term"]
+        with benchmark_environment():
+            rows = 0
+            for size in sorted(options["sizes"]):
+                self.seed_toppings(rows, size, options["batch_size"])
+                rows = size
+                bump_search_version(Topping)
+
+                start = time.perf_counter()
+                get_index(Topping)
+                build_ms = (time.perf_counter() - start) * 1000
+
+                scan = measure(
+                    lambda: list(
+                        Topping.objects.filter(name__icontains=term)[:6]
+                    ),
+                    options["repeat"],
+                )
+                indexed = measure(
+                    lambda: list(search(Topping, term)[:6]),
+                    options["repeat"],
+                )
+                self.stdout.write(
+                    f"{size:>9} toppings: "
+                    f"icontains p50 {scan['p50_ms']:.2f} ms, "
+                    f"p95 {scan['p95_ms']:.2f} ms; "
+                    f"index p50 {indexed['p50_ms']:.2f} ms, "
+                    f"p95 {indexed['p95_ms']:.2f} ms, "
+                    f"build {build_ms:.0f} ms"
+                )
+
+    @staticmethod
+    def seed_toppings(start: int, stop: int, batch_size: int) -> None:
+        for batch_start in range(start, stop, batch_size):
+            batch_stop = min(batch_start + batch_size, stop)
+            Topping.objects.bulk_create(
+                Topping(
+                    name=f"{WORDS[i % len(WORDS)]} {i}",
+                    price=1,
+                )
+                for i in range(batch_start, batch_stop)
+            )
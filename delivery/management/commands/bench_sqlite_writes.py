@@ -0,0 +1,147 @@
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from delivery.benchmark import cart_write_load, summarize_writes
+from delivery.models import Pizza, PizzaType
+
+PROFILES = {
+    "default": {},
+    "tuned": {"DJANGO_SQLITE_TUNED": "True"},
+}
+BENCH_USERNAME = "bench-writes"
+
+
+class Command(BaseCommand):
+    help = (
+        "Run concurrent cart writes (add pizza, change quantity, checkout) "
+        "from several processes against a scratch SQLite file, once with "
+        "the stock backend and once with the tuned profile. Prints a JSON "
+        "report of write throughput, latency and lock errors."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--processes", type=int, default=8)
+        parser.add_argument(
+            "--duration", type=float, default=10, help="Seconds per profile."
+        )
+        parser.add_argument(
+            "--profile",
+            action="append",
+            choices=sorted(PROFILES),
+            help="Profiles to run (default: all).",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the JSON report to this file instead of stdout.",
+        )
+        # Internal: the parent re-invokes the command in child processes.
+        parser.add_argument("--setup", action="store_true")
+        parser.add_argument("--worker", type=int)
+        parser.add_argument("--start", type=float)
+        parser.add_argument("--until", type=float)
+
+    def handle(self, *args, **options) -> None:
+        if options["setup"]:
+            return self.setup(options["processes"])
+        if options["worker"] is not None:
+            return self.work(options)
+        report = {
+            "processes": options["processes"],
+            "duration_s": options["duration"],
+            "profiles": {},
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            template = Path(directory) / "template.sqlite3"
+            self.call(template, {}, ["migrate", "--noinput"])
+            self.call(
+                template,
+                {},
+                ["bench_sqlite_writes", "--setup", "--processes"]
+                + [str(options["processes"])],
+            )
+            for name in options["profile"] or sorted(PROFILES):
+                database = Path(directory) / f"{name}.sqlite3"
+                shutil.copyfile(template, database)
+                report["profiles"][name] = self.run_profile(
+                    database, PROFILES[name], options
+                )
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            Path(options["output"]).write_text(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    @staticmethod
+    def environment(database: Path, extra: dict) -> dict:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{database}", **extra)
+        if "DJANGO_SQLITE_TUNED" not in extra:
+            env.pop("DJANGO_SQLITE_TUNED", None)
+        return env
+
+    def call(self, database: Path, extra: dict, arguments: list) -> None:
+        subprocess.run(
+            [sys.executable, "manage.py"] + arguments,
+            cwd=settings.BASE_DIR,
+            env=self.environment(database, extra),
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+
+    def run_profile(self, database: Path, extra: dict, options: dict) -> dict:
+        # Leave time for every child to import Django before the clock starts.
+        start = time.time() + 3
+        until = start + options["duration"]
+        workers = [
+            subprocess.Popen(
+                [sys.executable, "manage.py", "bench_sqlite_writes"]
+                + ["--worker", str(index)]
+                + ["--start", str(start), "--until", str(until)],
+                cwd=settings.BASE_DIR,
+                env=self.environment(database, extra),
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            for index in range(options["processes"])
+        ]
+        results = []
+        for worker in workers:
+            stdout, _ = worker.communicate()
+            if worker.returncode:
+                raise CommandError(f"Write worker exited {worker.returncode}")
+            results.append(json.loads(stdout))
+        summary = summarize_writes(results, options["duration"])
+        with sqlite3.connect(database) as connection:
+            summary["journal_mode"] = connection.execute(
+                "PRAGMA journal_mode"
+            ).fetchone()[0]
+        connection.close()
+        return summary
+
+    @staticmethod
+    def setup(processes: int) -> None:
+        pizza_type = PizzaType.objects.create(type="Benchmark")
+        Pizza.objects.create(name="Benchmark", price=10, type_pizza=pizza_type)
+        get_user_model().objects.bulk_create(
+            get_user_model()(username=f"{BENCH_USERNAME}-{index}")
+            for index in range(processes)
+        )
+
+    def work(self, options: dict) -> None:
+        customer = get_user_model().objects.get(
+            username=f"{BENCH_USERNAME}-{options['worker']}"
+        )
+        pizza_id = Pizza.objects.values_list("id", flat=True).first()
+        time.sleep(max(0, options["start"] - time.time()))
+        result = cart_write_load(customer, pizza_id, options["until"])
+        self.stdout.write(json.dumps(result))
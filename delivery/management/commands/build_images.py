@@ -0,0 +1,60 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from delivery.images import (
+    build_variants,
+    is_current,
+    read_manifest,
+    remove_outputs,
+    source_images,
+    supported_formats,
+    sync_assets,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate hashed AVIF/WebP variants of the site images at several "
+        "widths, write the manifest used by {% responsive_image %} and "
+        "record each image as an ImageAsset"
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rebuild variants even when the source is unchanged.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        try:
+            formats = supported_formats()
+        except ImportError:
+            raise CommandError("build_images requires Pillow")
+        source_dir = Path(settings.IMAGE_SOURCE_DIR)
+        output_dir = Path(settings.IMAGE_OUTPUT_DIR)
+        manifest_path = Path(settings.IMAGE_MANIFEST)
+        manifest = read_manifest(manifest_path)
+        built = {}
+        rebuilt = 0
+        for source in source_images(source_dir):
+            name = source.relative_to(source_dir).as_posix()
+            entry = manifest.get(name)
+            if options["force"] or not is_current(entry, source):
+                remove_outputs(entry)
+                entry = build_variants(source, source_dir, output_dir, formats)
+                rebuilt += 1
+            built[name] = entry
+        output_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps(built, indent=2, sort_keys=True))
+        assets = sync_assets(built)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Built variants for {rebuilt} of {len(built)} images "
+                f"({', '.join(formats) or 'no formats available'}), "
+                f"{assets} image assets updated"
+            )
+        )
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from delivery.feedback_queue import get_feedback_buffer, recover_spill_files
+
+
+class Command(BaseCommand):
+    help = (
+        "Write buffered feedback to the database, including spill files "
+        "left behind by processes that exited before flushing"
+    )
+
+    def handle(self, *args, **options) -> None:
+        saved = get_feedback_buffer().flush()
+        saved += recover_spill_files(settings.FEEDBACK_SPILL_DIR)
+        self.stdout.write(
+            self.style.SUCCESS(f"Flushed {saved} feedback entries")
+        )
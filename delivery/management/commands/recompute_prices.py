@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from delivery.models import OrderItem
+from delivery.pricing import refresh_line_prices
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored price_with_toppings of every order item"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10000,
+            help="Number of order items updated per statement.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        chunk_size = options["chunk_size"]
+        last_pk = 0
+        updated = 0
+        while True:
+            item_ids = list(
+                OrderItem.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:chunk_size]
+            )
+            if not item_ids:
+                break
+            updated += refresh_line_prices(
+                OrderItem.objects.filter(pk__gt=last_pk, pk__lte=item_ids[-1])
+            )
+            last_pk = item_ids[-1]
+        self.stdout.write(
+            self.style.SUCCESS(f"Recomputed prices of {updated} order items")
+        )
@@ -0,0 +1,20 @@
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+
+from delivery.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Recount the cached home page counters from the database"
+
+    def handle(self, *args, **options) -> None:
+        if isinstance(caches["default"], LocMemCache):
+            raise CommandError(
+                "The counters are in a per-process LocMem cache that the "
+                "web workers cannot see; set a shared DJANGO_CACHE_BACKEND"
+            )
+        counters = reconcile_counters()
+        for name, value in counters.items():
+            self.stdout.write(f"{name}: {value}")
+        self.stdout.write(self.style.SUCCESS("Counters reconciled"))
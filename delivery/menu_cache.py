@@ -0,0 +1,80 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from delivery.db.routers import read_from_primary
+from delivery.models import Pizza, PizzaType
+
+MENU_VERSION_KEY = "menu:version"
+MENU_CACHE_TIMEOUT = 60 * 60 * 24
+CSRF_TOKEN_PLACEHOLDER = "__menu_csrf_token__"
+
+
+def get_menu_version() -> int:
+    version = cache.get(MENU_VERSION_KEY)
+    if version is None:
+        cache.add(
+            MENU_VERSION_KEY, time.time_ns(), settings.CACHE_VERSION_TIMEOUT
+        )
+        version = cache.get(MENU_VERSION_KEY)
+    return version
+
+
+def bump_menu_version() -> None:
+    try:
+        cache.incr(MENU_VERSION_KEY)
+    except ValueError:
+        cache.add(
+            MENU_VERSION_KEY, time.time_ns(), settings.CACHE_VERSION_TIMEOUT
+        )
+
+
+def get_menu() -> dict:
+    version = get_menu_version()
+    key = f"menu:{version}:snapshot"
+    menu = cache.get(key)
+    if menu is None:
+        # Rebuilt right after an invalidation and then cached for a day, so
+        # it must not come from a replica that has not caught up yet.
+        with read_from_primary():
+            menu = {
+                "version": version,
+                "pizza_types": list(PizzaType.objects.all()),
+                "pizzas": list(
+                    Pizza.objects.filter(is_custom_pizza=False)
+                    .select_related("image")
+                    .prefetch_related("topping")
+                ),
+            }
+        cache.set(key, menu, MENU_CACHE_TIMEOUT)
+    return menu
+
+
+def render_menu_fragment(
+    request, menu: dict, pizzas: list, type_id: int = None
+) -> str:
+    can_change = request.user.has_perm("delivery.change_pizza")
+    can_delete = request.user.has_perm("delivery.delete_pizza")
+    key = (
+        f"menu:{menu['version']}:fragment:{type_id or 'all'}:"
+        f"{int(can_change)}{int(can_delete)}"
+    )
+    fragment = cache.get(key)
+    if fragment is None:
+        fragment = render_to_string(
+            "includes/pizza_menu_items.html",
+            {
+                "pizza_menu": pizzas,
+                "can_change_pizza": can_change,
+                "can_delete_pizza": can_delete,
+                "csrf_token": CSRF_TOKEN_PLACEHOLDER,
+            },
+        )
+        cache.set(key, fragment, MENU_CACHE_TIMEOUT)
+    return mark_safe(
+        fragment.replace(CSRF_TOKEN_PLACEHOLDER, get_token(request))
+    )
@@ -0,0 +1,123 @@
+import math
+import threading
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, math.inf
+)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, math.inf)
+
+_lock = threading.Lock()
+_counters = {}
+_gauges = {}
+_histograms = {}
+
+
+def label_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+def increment(name: str, amount: float = 1, **labels) -> None:
+    key = label_key(labels)
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0) + amount
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    with _lock:
+        _gauges.setdefault(name, {})[label_key(labels)] = value
+
+
+def observe(
+    name: str, value: float, buckets: tuple = LATENCY_BUCKETS, **labels
+) -> None:
+    key = label_key(labels)
+    with _lock:
+        series = _histograms.setdefault(name, {})
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = {
+                "buckets": dict.fromkeys(buckets, 0),
+                "count": 0,
+                "sum": 0.0,
+            }
+        for bound in histogram["buckets"]:
+            if value <= bound:
+                histogram["buckets"][bound] += 1
+                break
+        histogram["count"] += 1
+        histogram["sum"] += value
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {
+            "counters": {
+                name: dict(series) for name, series in _counters.items()
+            },
+            "gauges": {
+                name: dict(series) for name, series in _gauges.items()
+            },
+            "histograms": {
+                name: {
+                    key: {
+                        "buckets": dict(histogram["buckets"]),
+                        "count": histogram["count"],
+                        "sum": histogram["sum"],
+                    }
+                    for key, histogram in series.items()
+                }
+                for name, series in _histograms.items()
+            },
+        }
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _histograms.clear()
+
+
+def format_labels(key: tuple, **extra) -> str:
+    labels = list(key) + list(extra.items())
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value)
+            .replace("\\", "\\\\")
+            .replace("\n", "\\n")
+            .replace('"', '\\"'),
+        )
+        for name, value in labels
+    )
+    return "{" + pairs + "}"
+
+
+def format_bound(bound: float) -> str:
+    return "+Inf" if bound == math.inf else repr(float(bound))
+
+
+def render_prometheus(prefix: str = "delivery_") -> str:
+    data = snapshot()
+    lines = []
+    for kind in ("counters", "gauges"):
+        metric_type = "counter" if kind == "counters" else "gauge"
+        for name, series in sorted(data[kind].items()):
+            lines.append(f"# TYPE {prefix}{name} {metric_type}")
+            for key, value in sorted(series.items()):
+                lines.append(f"{prefix}{name}{format_labels(key)} {value}")
+    for name, series in sorted(data["histograms"].items()):
+        lines.append(f"# TYPE {prefix}{name} histogram")
+        for key, histogram in sorted(series.items()):
+            cumulative = 0
+            for bound, count in histogram["buckets"].items():
+                cumulative += count
+                labels = format_labels(key, le=format_bound(bound))
+                lines.append(f"{prefix}{name}_bucket{labels} {cumulative}")
+            labels = format_labels(key)
+            lines.append(f"{prefix}{name}_sum{labels} {histogram['sum']}")
+            lines.append(f"{prefix}{name}_count{labels} {histogram['count']}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,129 @@
+import hashlib
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from delivery import metrics
+from delivery.db import routers
+from delivery.metrics import COUNT_BUCKETS
+
+FINGERPRINT_SQL_LENGTH = 200
+
+
+class QueryRecorder:
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] = self.statements.get(sql, 0) + 1
+
+    def duplicates(self) -> dict:
+        return {
+            sql: count - 1
+            for sql, count in self.statements.items()
+            if count > 1
+        }
+
+
+def fingerprint(sql: str) -> str:
+    return hashlib.sha1(sql.encode()).hexdigest()[:12]
+
+
+def view_name(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match else "unresolved"
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        latency = time.perf_counter() - start
+
+        view = view_name(request)
+        metrics.increment(
+            "requests_total", view=view, status=response.status_code
+        )
+        metrics.observe("request_latency_seconds", latency, view=view)
+        metrics.observe("request_sql_seconds", recorder.seconds, view=view)
+        metrics.observe(
+            "request_queries", recorder.count, COUNT_BUCKETS, view=view
+        )
+        for sql, count in recorder.duplicates().items():
+            key = fingerprint(sql)
+            metrics.increment(
+                "duplicate_queries_total", count, view=view, fingerprint=key
+            )
+            metrics.set_gauge(
+                "query_fingerprint_info",
+                1,
+                fingerprint=key,
+                sql=sql[:FINGERPRINT_SQL_LENGTH],
+            )
+        return response
+
+    def process_template_response(self, request, response):
+        start = time.perf_counter()
+
+        def record_render_time(rendered) -> None:
+            metrics.observe(
+                "template_render_seconds",
+                time.perf_counter() - start,
+                view=view_name(request),
+            )
+
+        response.add_post_render_callback(record_render_time)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state, token = routers.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.end_request(token)
+        return self.pin(request, response, state)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method in routers.SAFE_METHODS
+            and routers.PIN_COOKIE_NAME not in request.COOKIES
+            and routers.replica_view(view_name(request))
+        ):
+            routers.use_replica()
+        return None
+
+    @staticmethod
+    def pin(request, response, state: dict):
+        # Keep this client on the primary until the replicas catch up with
+        # what it just wrote.
+        if state["wrote"] or request.method not in routers.SAFE_METHODS:
+            response.set_cookie(
+                routers.PIN_COOKIE_NAME,
+                "1",
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
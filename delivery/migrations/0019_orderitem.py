@@ -0,0 +1,58 @@
+# Generated by Django 4.0.3 on 2026-10-18 17:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("delivery", "0018_alter_pizza_topping"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("quantity", models.IntegerField(default=1)),
+                ("price", models.DecimalField(decimal_places=2, max_digits=6)),
+                (
+                    "price_with_toppings",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=6),
+                ),
+                (
+                    "order",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="items",
+                        to="delivery.order",
+                    ),
+                ),
+                (
+                    "pizza",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="order_items",
+                        to="delivery.pizza",
+                    ),
+                ),
+                (
+                    "topping",
+                    models.ManyToManyField(
+                        blank=True,
+                        related_name="order_item_topping",
+                        to="delivery.topping",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,79 @@
+from django.db import migrations
+from django.db.models import (
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce
+
+MONEY_FIELD = DecimalField(max_digits=10, decimal_places=2)
+
+
+def line_price_expression(OrderItem):
+    # pricing.line_price_expression, against the historical models.
+    toppings = OrderItem.topping.through.objects.filter(
+        orderitem=OuterRef("pk")
+    ).values("orderitem").annotate(
+        total=Sum("topping__price")
+    ).values("total")
+    return ExpressionWrapper(
+        F("price") * F("quantity")
+        + Coalesce(
+            Subquery(toppings, output_field=MONEY_FIELD),
+            Value(0),
+            output_field=MONEY_FIELD,
+        ),
+        output_field=MONEY_FIELD,
+    )
+
+
+def convert_custom_pizzas(apps, schema_editor):
+    Pizza = apps.get_model("delivery", "Pizza")
+    Order = apps.get_model("delivery", "Order")
+    OrderItem = apps.get_model("delivery", "OrderItem")
+
+    catalog = {}
+    for pizza in Pizza.objects.filter(is_custom_pizza=False).order_by("pk"):
+        catalog.setdefault(pizza.name, pizza)
+
+    order_lines = Order.pizza.through.objects.select_related(
+        "pizza"
+    ).order_by("pk")
+    for line in order_lines.iterator():
+        pizza = line.pizza
+        catalog_pizza = pizza
+        if pizza.is_custom_pizza:
+            catalog_pizza = catalog.get(pizza.name, pizza)
+        item = OrderItem.objects.create(
+            order_id=line.order_id,
+            pizza=catalog_pizza,
+            quantity=pizza.quantity,
+            price=pizza.price,
+        )
+        item.topping.set(pizza.topping.all())
+
+    # Pizza.price_with_toppings was only written when a page rendered it,
+    # so compute every line price rather than copying a stale one.
+    OrderItem.objects.update(
+        price_with_toppings=line_price_expression(OrderItem)
+    )
+
+    Pizza.objects.filter(
+        is_custom_pizza=True, order_items__isnull=True
+    ).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("delivery", "0019_orderitem"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            convert_custom_pizzas, reverse_code=migrations.RunPython.noop
+        ),
+    ]
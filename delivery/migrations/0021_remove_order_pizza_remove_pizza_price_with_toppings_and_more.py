@@ -0,0 +1,25 @@
+# Generated by Django 4.0.3 on 2026-10-18 17:52
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("delivery", "0020_convert_custom_pizzas_to_order_items"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="order",
+            name="pizza",
+        ),
+        migrations.RemoveField(
+            model_name="pizza",
+            name="price_with_toppings",
+        ),
+        migrations.RemoveField(
+            model_name="pizza",
+            name="quantity",
+        ),
+    ]
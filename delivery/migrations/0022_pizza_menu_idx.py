@@ -0,0 +1,22 @@
+# Generated by Django 4.0.3 on 2026-10-18 17:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "delivery",
+            "0021_remove_order_pizza_remove_pizza_price_with_toppings_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="pizza",
+            index=models.Index(
+                fields=["is_custom_pizza", "type_pizza", "name"], name="pizza_menu_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.0.3 on 2026-10-18 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("delivery", "0022_pizza_menu_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["customer", "status"], name="order_customer_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="receipt",
+            index=models.Index(
+                fields=["customer_order", "order_time"], name="receipt_order_time_idx"
+            ),
+        ),
+    ]
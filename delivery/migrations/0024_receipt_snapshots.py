@@ -0,0 +1,65 @@
+# Generated by Django 4.0.3 on 2026-10-18 18:02
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("delivery", "0023_order_receipt_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="receipt",
+            name="topping_total_price",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=8),
+        ),
+        migrations.AddField(
+            model_name="receipt",
+            name="total_price",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=8),
+        ),
+        migrations.CreateModel(
+            name="ReceiptLine",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("pizza_name", models.CharField(max_length=63)),
+                ("price", models.DecimalField(decimal_places=2, max_digits=6)),
+                (
+                    "toppings",
+                    models.JSONField(
+                        default=list,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                    ),
+                ),
+                (
+                    "topping_price",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=6),
+                ),
+                ("quantity", models.IntegerField(default=1)),
+                (
+                    "price_with_toppings",
+                    models.DecimalField(decimal_places=2, max_digits=6),
+                ),
+                (
+                    "receipt",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="lines",
+                        to="delivery.receipt",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations
+
+
+def backfill_receipt_lines(apps, schema_editor):
+    Receipt = apps.get_model("delivery", "Receipt")
+    ReceiptLine = apps.get_model("delivery", "ReceiptLine")
+    OrderItem = apps.get_model("delivery", "OrderItem")
+
+    for receipt in Receipt.objects.order_by("pk").iterator():
+        items = (
+            OrderItem.objects.filter(order_id=receipt.customer_order_id)
+            .select_related("pizza")
+            .prefetch_related("topping")
+        )
+        lines = []
+        for item in items:
+            toppings = [
+                {"name": topping.name, "price": str(topping.price)}
+                for topping in item.topping.all()
+            ]
+            topping_price = sum(
+                topping.price for topping in item.topping.all()
+            )
+            lines.append(
+                ReceiptLine(
+                    receipt=receipt,
+                    pizza_name=item.pizza.name,
+                    price=item.price,
+                    toppings=toppings,
+                    topping_price=topping_price,
+                    quantity=item.quantity,
+                    # Same formula as the line prices recomputed in 0020.
+                    price_with_toppings=(
+                        item.price * item.quantity + topping_price
+                    ),
+                )
+            )
+        ReceiptLine.objects.bulk_create(lines)
+        receipt.total_price = sum(line.price_with_toppings for line in lines)
+        receipt.topping_total_price = sum(line.topping_price for line in lines)
+        receipt.save(update_fields=["total_price", "topping_total_price"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("delivery", "0024_receipt_snapshots"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_receipt_lines, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.0.3 on 2026-10-18 18:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("delivery", "0026_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="feedback",
+            index=models.Index(
+                fields=["created_time", "id"], name="feedback_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="topping",
+            index=models.Index(fields=["price", "id"], name="topping_price_idx"),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.0.3 on 2026-10-18 18:11
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("delivery", "0027_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="feedback",
+            name="created_time",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+    ]
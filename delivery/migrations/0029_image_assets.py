@@ -0,0 +1,47 @@
+# Generated by Django 4.0.3 on 2026-10-18 18:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("delivery", "0028_feedback_created_time_default"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImageAsset",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("path", models.CharField(max_length=255, unique=True)),
+                ("content_hash", models.CharField(max_length=12)),
+                ("width", models.PositiveIntegerField()),
+                ("height", models.PositiveIntegerField()),
+                ("placeholder", models.CharField(default="#eeeeee", max_length=7)),
+            ],
+            options={
+                "ordering": ["path"],
+            },
+        ),
+        migrations.AddField(
+            model_name="pizza",
+            name="image",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="pizzas",
+                to="delivery.imageasset",
+            ),
+        ),
+    ]
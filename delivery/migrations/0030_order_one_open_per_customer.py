@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+
+def merge_open_orders(apps, schema_editor):
+    Order = apps.get_model("delivery", "Order")
+    OrderItem = apps.get_model("delivery", "OrderItem")
+
+    kept = {}
+    for order in Order.objects.filter(status=False).order_by("pk"):
+        if order.customer_id not in kept:
+            kept[order.customer_id] = order.pk
+            continue
+        OrderItem.objects.filter(order_id=order.pk).update(
+            order_id=kept[order.customer_id]
+        )
+        order.delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("delivery", "0029_image_assets"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            merge_open_orders, reverse_code=migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name="order",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(status=False),
+                fields=("customer",),
+                name="order_one_open_per_customer",
+            ),
+        ),
+    ]
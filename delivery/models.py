@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 
 from delivery_pizza import settings
 
@@ -28,7 +30,9 @@ class Customer(AbstractUser):
 
 class FeedBack(models.Model):
     comment = models.TextField()
-    created_time = models.DateTimeField(auto_now_add=True)
+    created_time = models.DateTimeField(
+        default=timezone.now, editable=False
+    )
     customer = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         related_name="feedback",
@@ -37,6 +41,11 @@ class FeedBack(models.Model):
 
     class Meta:
         ordering = ["created_time"]
+        indexes = [
+            models.Index(
+                fields=["created_time", "id"], name="feedback_created_idx"
+            ),
+        ]
 
 
 class PizzaType(models.Model):
@@ -52,46 +61,137 @@ class Topping(models.Model):
 
     class Meta:
         ordering = ["price"]
+        indexes = [
+            models.Index(fields=["price", "id"], name="topping_price_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.name}: {self.price}"
 
 
+class ImageAsset(models.Model):
+    path = models.CharField(max_length=255, unique=True)
+    content_hash = models.CharField(max_length=12)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    placeholder = models.CharField(max_length=7, default="#eeeeee")
+
+    class Meta:
+        ordering = ["path"]
+
+    def __str__(self) -> str:
+        return self.path
+
+
 class Pizza(models.Model):
     name = models.CharField(max_length=63)
     type_pizza = models.ForeignKey(PizzaType, on_delete=models.CASCADE)
-    price = models.DecimalField(max_digits=6, decimal_places=2)
-    price_with_toppings = models.DecimalField(
-        max_digits=6, decimal_places=2, default=0
+    image = models.ForeignKey(
+        ImageAsset,
+        related_name="pizzas",
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
     )
+    price = models.DecimalField(max_digits=6, decimal_places=2)
     ingredients = models.TextField(blank=True, null=True)
     topping = models.ManyToManyField(
         Topping, related_name="pizza_topping"
     )
-    quantity = models.IntegerField(default=1)
     is_custom_pizza = models.BooleanField(default=False)
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            models.Index(
+                fields=["is_custom_pizza", "type_pizza", "name"],
+                name="pizza_menu_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.name}: {self.price}"
 
 
 class Order(models.Model):
-    pizza = models.ManyToManyField(Pizza, related_name="order")
     status = models.BooleanField(default=False)
     customer = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["customer", "status"],
+                name="order_customer_status_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["customer"],
+                condition=models.Q(status=False),
+                name="order_one_open_per_customer",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Order #{self.pk}"
+
+
+class OrderItem(models.Model):
+    order = models.ForeignKey(
+        Order, related_name="items", on_delete=models.CASCADE
+    )
+    pizza = models.ForeignKey(
+        Pizza, related_name="order_items", on_delete=models.CASCADE
+    )
+    topping = models.ManyToManyField(
+        Topping, related_name="order_item_topping", blank=True
+    )
+    quantity = models.IntegerField(default=1)
+    price = models.DecimalField(max_digits=6, decimal_places=2)
+    price_with_toppings = models.DecimalField(
+        max_digits=6, decimal_places=2, default=0
+    )
+
     def __str__(self) -> str:
-        return f"{self.pizza.name}"
+        return f"{self.pizza.name}: {self.quantity}"
 
 
 class Receipt(models.Model):
     customer_order = models.ForeignKey(Order, on_delete=models.CASCADE)
     order_time = models.DateTimeField(auto_now_add=True)
+    total_price = models.DecimalField(
+        max_digits=8, decimal_places=2, default=0
+    )
+    topping_total_price = models.DecimalField(
+        max_digits=8, decimal_places=2, default=0
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["customer_order", "order_time"],
+                name="receipt_order_time_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"Receipt #{self.pk} ({self.order_time})"
+
+
+class ReceiptLine(models.Model):
+    receipt = models.ForeignKey(
+        Receipt, related_name="lines", on_delete=models.CASCADE
+    )
+    pizza_name = models.CharField(max_length=63)
+    price = models.DecimalField(max_digits=6, decimal_places=2)
+    toppings = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+    topping_price = models.DecimalField(
+        max_digits=6, decimal_places=2, default=0
+    )
+    quantity = models.IntegerField(default=1)
+    price_with_toppings = models.DecimalField(max_digits=6, decimal_places=2)
+
+    def __str__(self) -> str:
+        return f"{self.pizza_name}: {self.quantity}"
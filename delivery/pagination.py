@@ -0,0 +1,138 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Model, Q, QuerySet
+from django.http import Http404
+
+
+class KeysetPage:
+    def __init__(
+        self,
+        object_list: list,
+        next_cursor: str = None,
+        previous_cursor: str = None,
+    ) -> None:
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    NEXT = ">"
+    PREVIOUS = "<"
+
+    def __init__(
+        self, queryset: QuerySet, per_page: int, ordering: tuple
+    ) -> None:
+        self.queryset = queryset.order_by(*ordering)
+        self.per_page = per_page
+        self.ordering = ordering
+        self.fields = [field.lstrip("-") for field in ordering]
+
+    def encode_cursor(self, obj: Model, direction: str = NEXT) -> str:
+        values = [direction] + [getattr(obj, field) for field in self.fields]
+        data = json.dumps(values, default=str)
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def decode_cursor(self, cursor: str) -> tuple:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise Http404("Invalid cursor")
+        if (
+            not isinstance(values, list)
+            or len(values) != len(self.fields) + 1
+            or values[0] not in (self.NEXT, self.PREVIOUS)
+        ):
+            raise Http404("Invalid cursor")
+        opts = self.queryset.model._meta
+        try:
+            fields = [
+                opts.get_field(field).to_python(value)
+                for field, value in zip(self.fields, values[1:])
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise Http404("Invalid cursor")
+        # Keyset fields are never null; to_python passes None through.
+        if None in fields:
+            raise Http404("Invalid cursor")
+        return values[0], fields
+
+    def after(self, values: list, reverse: bool = False) -> Q:
+        lookups = [
+            "lt" if field.startswith("-") != reverse else "gt"
+            for field in self.ordering
+        ]
+        condition = Q()
+        for index, lookup in enumerate(lookups):
+            step = Q(**{f"{self.fields[index]}__{lookup}": values[index]})
+            for name, value in zip(self.fields[:index], values[:index]):
+                step &= Q(**{name: value})
+            condition |= step
+        bound = Q(**{f"{self.fields[0]}__{lookups[0]}e": values[0]})
+        return bound & condition
+
+    def reversed_ordering(self) -> list:
+        return [
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in self.ordering
+        ]
+
+    def page(self, cursor: str = None) -> KeysetPage:
+        direction, values = self.NEXT, None
+        if cursor:
+            direction, values = self.decode_cursor(cursor)
+        if direction == self.PREVIOUS:
+            queryset = self.queryset.filter(
+                self.after(values, reverse=True)
+            ).order_by(*self.reversed_ordering())
+        elif values is not None:
+            queryset = self.queryset.filter(self.after(values))
+        else:
+            queryset = self.queryset
+        object_list = list(queryset[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if direction == self.PREVIOUS:
+            object_list.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+        if not object_list:
+            return KeysetPage(object_list)
+        return KeysetPage(
+            object_list,
+            self.encode_cursor(object_list[-1]) if has_next else None,
+            self.encode_cursor(object_list[0], self.PREVIOUS)
+            if has_previous
+            else None,
+        )
+
+
+class KeysetPaginationMixin:
+    keyset_ordering = ("-pk",)
+    cursor_kwarg = "cursor"
+
+    def paginate_queryset(self, queryset: QuerySet, page_size: int) -> tuple:
+        paginator = KeysetPaginator(
+            queryset, page_size, self.keyset_ordering
+        )
+        page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
@@ -0,0 +1,50 @@
+from django.db.models import (
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    QuerySet,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce
+
+from delivery.models import OrderItem
+
+MONEY_FIELD = DecimalField(max_digits=10, decimal_places=2)
+
+
+def topping_price_subquery() -> Coalesce:
+    toppings = OrderItem.topping.through.objects.filter(
+        orderitem=OuterRef("pk")
+    ).values("orderitem").annotate(
+        total=Sum("topping__price")
+    ).values("total")
+    return Coalesce(
+        Subquery(toppings, output_field=MONEY_FIELD),
+        Value(0),
+        output_field=MONEY_FIELD,
+    )
+
+
+def line_price_expression() -> ExpressionWrapper:
+    return ExpressionWrapper(
+        F("price") * F("quantity") + topping_price_subquery(),
+        output_field=MONEY_FIELD,
+    )
+
+
+def refresh_line_prices(items: QuerySet) -> int:
+    return items.update(price_with_toppings=line_price_expression())
+
+
+def get_total_price(items: QuerySet) -> tuple:
+    totals = items.aggregate(
+        total_price=Sum("price_with_toppings"),
+        base_price=Sum(
+            F("price") * F("quantity"), output_field=MONEY_FIELD
+        ),
+    )
+    total_price = totals["total_price"] or 0
+    return total_price, total_price - (totals["base_price"] or 0)
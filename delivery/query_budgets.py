@@ -0,0 +1,30 @@
+# Maximum queries per request on a cold cache, counting the session and
+# user lookups. delivery/tests/test_query_budgets.py enforces them.
+QUERY_BUDGETS = {
+    "delivery:index": 6,
+    "delivery:about": 2,
+    "delivery:metrics": 2,
+    "delivery:search-suggest": 4,
+    "delivery:pizza-menu-list": 5,
+    "delivery:pizza-menu-type-list": 5,
+    "delivery:pizza-update": 5,
+    "delivery:pizza-create": 4,
+    "delivery:pizza-delete": 3,
+    "delivery:customer-detail": 3,
+    "delivery:customer-update": 3,
+    "delivery:customer-register": 2,
+    "delivery:topping-update": 3,
+    "delivery:topping-create": 2,
+    "delivery:topping-delete": 3,
+    "delivery:topping-list": 3,
+    "delivery:order-list": 6,
+    "delivery:order-add-pizza": 6,
+    "delivery:order-delete": 8,
+    "delivery:order-increment": 3,
+    "delivery:order-decrement": 3,
+    "delivery:feedback-list": 3,
+    "delivery:receipt-create": 10,
+    "delivery:receipt-list": 4,
+    "delivery:clean-order": 10,
+    "delivery:choose-topping": 8,
+}
@@ -0,0 +1,232 @@
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, QuerySet, When
+
+from delivery.models import Pizza, Topping
+
+NGRAM_SIZE = 3
+SUGGEST_LIMIT = 8
+SEARCH_FIELDS = {
+    Topping: ("name",),
+    Pizza: ("name", "ingredients"),
+}
+
+_indexes = {}
+_suggestions = None
+
+
+def ngrams(text: str) -> set:
+    return {
+        text[start:start + NGRAM_SIZE]
+        for start in range(len(text) - NGRAM_SIZE + 1)
+    }
+
+
+def normalize(text: str) -> str:
+    return " ".join((text or "").split()).casefold()
+
+
+def rank(name: str, term: str) -> int:
+    if name == term:
+        return 0
+    if name.startswith(term):
+        return 1
+    if term in name:
+        return 2
+    return 3
+
+
+class NgramIndex:
+    def __init__(self, entries) -> None:
+        self.pks = []
+        self.names = []
+        self.texts = []
+        self.postings = {}
+        for pk, name, text in entries:
+            position = len(self.pks)
+            self.pks.append(pk)
+            self.names.append(normalize(name))
+            self.texts.append(normalize(text))
+            for gram in ngrams(self.texts[-1]):
+                self.postings.setdefault(gram, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.pks)
+
+    def candidates(self, term: str):
+        if len(term) < NGRAM_SIZE:
+            return range(len(self.pks))
+        postings = sorted(
+            (self.postings.get(gram, ()) for gram in ngrams(term)), key=len
+        )
+        if not postings[0]:
+            return ()
+        matches = set(postings[0])
+        for positions in postings[1:]:
+            matches.intersection_update(positions)
+        return matches
+
+    def search(self, term: str) -> list:
+        term = normalize(term)
+        matches = [
+            position for position in self.candidates(term)
+            if term in self.texts[position]
+        ]
+        matches.sort(
+            key=lambda position: (
+                rank(self.names[position], term),
+                self.names[position],
+                self.pks[position],
+            )
+        )
+        return [self.pks[position] for position in matches]
+
+
+class PrefixIndex:
+    def __init__(self, entries) -> None:
+        self.entries = []
+        for kind, pk, name in entries:
+            words = normalize(name).split()
+            for offset in range(len(words)):
+                key = " ".join(words[offset:])
+                self.entries.append((key, offset, name, kind, pk))
+        self.entries.sort()
+        self.keys = [entry[0] for entry in self.entries]
+
+    def suggest(self, term: str, limit: int = SUGGEST_LIMIT) -> list:
+        term = normalize(term)
+        if not term:
+            return []
+        results = []
+        seen = set()
+        position = bisect_left(self.keys, term)
+        while position < len(self.keys) and len(results) < limit:
+            key, offset, name, kind, pk = self.entries[position]
+            if not key.startswith(term):
+                break
+            if (kind, pk) not in seen:
+                seen.add((kind, pk))
+                results.append({"type": kind, "id": pk, "name": name})
+            position += 1
+        return results
+
+
+class SearchResults:
+    def __init__(self, queryset: QuerySet, pks: list) -> None:
+        self.queryset = queryset
+        self.pks = pks
+
+    def __len__(self) -> int:
+        return len(self.pks)
+
+    def count(self) -> int:
+        return len(self.pks)
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        pks = self.pks[key]
+        objects = self.queryset.in_bulk(pks)
+        return [objects[pk] for pk in pks if pk in objects]
+
+
+def searchable(model: type) -> QuerySet:
+    queryset = model.objects.all()
+    if model is Pizza:
+        queryset = queryset.filter(is_custom_pizza=False)
+    return queryset
+
+
+def search_version_key(model: type) -> str:
+    return f"search:{model._meta.label_lower}:version"
+
+
+def get_search_version(model: type) -> int:
+    key = search_version_key(model)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), settings.CACHE_VERSION_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def bump_search_version(model: type) -> None:
+    try:
+        cache.incr(search_version_key(model))
+    except ValueError:
+        cache.add(
+            search_version_key(model),
+            time.time_ns(),
+            settings.CACHE_VERSION_TIMEOUT,
+        )
+
+
+def build_index(model: type) -> NgramIndex:
+    fields = SEARCH_FIELDS[model]
+    rows = searchable(model).values_list("pk", *fields).iterator()
+    return NgramIndex(
+        (row[0], row[1], " ".join(value or "" for value in row[1:]))
+        for row in rows
+    )
+
+
+def get_index(model: type) -> NgramIndex:
+    version = get_search_version(model)
+    cached = _indexes.get(model)
+    if cached is None or cached[0] != version:
+        cached = (version, build_index(model))
+        _indexes[model] = cached
+    return cached[1]
+
+
+def trigram_search(model: type, term: str) -> QuerySet:
+    fields = SEARCH_FIELDS[model]
+    name = fields[0]
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f"{field}__icontains": term})
+    return searchable(model).filter(condition).annotate(
+        search_rank=Case(
+            When(**{f"{name}__iexact": term}, then=0),
+            When(**{f"{name}__istartswith": term}, then=1),
+            When(**{f"{name}__icontains": term}, then=2),
+            default=3,
+            output_field=IntegerField(),
+        )
+    ).order_by("search_rank", name, "pk")
+
+
+def search(model: type, term: str):
+    if connection.vendor == "postgresql":
+        return trigram_search(model, term)
+    return SearchResults(searchable(model), get_index(model).search(term))
+
+
+def get_suggestion_version() -> str:
+    return ".".join(
+        str(get_search_version(model)) for model in SEARCH_FIELDS
+    )
+
+
+def get_suggestions() -> PrefixIndex:
+    global _suggestions
+    version = get_suggestion_version()
+    cached = _suggestions
+    if cached is None or cached[0] != version:
+        entries = []
+        for model in SEARCH_FIELDS:
+            kind = model._meta.model_name
+            entries.extend(
+                (kind, pk, name)
+                for pk, name in searchable(model).values_list("pk", "name")
+            )
+        cached = (version, PrefixIndex(entries))
+        _suggestions = cached
+    return cached[1]
@@ -0,0 +1,165 @@
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.contrib.auth.models import Group, Permission
+from django.contrib.auth.signals import user_logged_out
+from django.dispatch import receiver
+
+from delivery.auth import bump_permissions_version, forget_user
+from delivery.counters import adjust_counter
+from delivery.menu_cache import bump_menu_version
+from delivery.models import (
+    Customer,
+    FeedBack,
+    ImageAsset,
+    OrderItem,
+    Pizza,
+    PizzaType,
+    Topping,
+)
+from delivery.pricing import refresh_line_prices
+from delivery.search import bump_search_version
+
+
+@receiver(post_save, sender=OrderItem)
+def refresh_order_item_price(
+    sender, instance: OrderItem, **kwargs
+) -> None:
+    refresh_line_prices(OrderItem.objects.filter(pk=instance.pk))
+
+
+@receiver(m2m_changed, sender=OrderItem.topping.through)
+def refresh_order_item_topping_price(
+    sender, instance, action: str, reverse: bool, pk_set: set, **kwargs
+) -> None:
+    if reverse and action == "pre_clear":
+        instance.cleared_order_item_ids = list(
+            instance.order_item_topping.values_list("pk", flat=True)
+        )
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        item_ids = [instance.pk]
+    elif action == "post_clear":
+        item_ids = instance.cleared_order_item_ids
+    else:
+        item_ids = pk_set
+    refresh_line_prices(OrderItem.objects.filter(pk__in=item_ids))
+
+
+@receiver(post_save, sender=Topping)
+def refresh_topping_order_items_price(
+    sender, instance: Topping, created: bool, **kwargs
+) -> None:
+    if not created:
+        refresh_line_prices(
+            OrderItem.objects.filter(topping=instance, order__status=False)
+        )
+
+
+@receiver(pre_delete, sender=Topping)
+def collect_topping_order_items(
+    sender, instance: Topping, **kwargs
+) -> None:
+    instance.deleted_order_item_ids = list(
+        instance.order_item_topping.filter(
+            order__status=False
+        ).values_list("pk", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Topping)
+def refresh_deleted_topping_order_items_price(
+    sender, instance: Topping, **kwargs
+) -> None:
+    refresh_line_prices(
+        OrderItem.objects.filter(pk__in=instance.deleted_order_item_ids)
+    )
+
+
+@receiver(post_save, sender=Pizza)
+@receiver(post_delete, sender=Pizza)
+@receiver(post_save, sender=PizzaType)
+@receiver(post_delete, sender=PizzaType)
+@receiver(post_save, sender=Topping)
+@receiver(post_delete, sender=Topping)
+@receiver(post_save, sender=ImageAsset)
+@receiver(post_delete, sender=ImageAsset)
+def invalidate_menu(sender, **kwargs) -> None:
+    # Bumping before commit lets a concurrent request cache the old rows
+    # under the new version.
+    transaction.on_commit(bump_menu_version)
+
+
+@receiver(m2m_changed, sender=Pizza.topping.through)
+def invalidate_menu_toppings(sender, action: str, **kwargs) -> None:
+    if action.startswith("post_"):
+        transaction.on_commit(bump_menu_version)
+
+
+@receiver(post_save, sender=Pizza)
+@receiver(post_delete, sender=Pizza)
+@receiver(post_save, sender=Topping)
+@receiver(post_delete, sender=Topping)
+def invalidate_search(sender, instance, **kwargs) -> None:
+    if not getattr(instance, "is_custom_pizza", False):
+        transaction.on_commit(lambda: bump_search_version(sender))
+
+
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+def invalidate_cached_user(sender, instance: Customer, **kwargs) -> None:
+    # After commit, or a request could re-cache the old row, password hash
+    # included, before the change is visible.
+    user_id = instance.pk
+    transaction.on_commit(lambda: forget_user(user_id))
+
+
+@receiver(user_logged_out)
+def forget_logged_out_user(sender, request, user, **kwargs) -> None:
+    if user is not None:
+        forget_user(user.pk)
+
+
+@receiver(m2m_changed, sender=Customer.groups.through)
+@receiver(m2m_changed, sender=Customer.user_permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_cached_permissions(sender, action: str, **kwargs) -> None:
+    if action.startswith("post_"):
+        transaction.on_commit(bump_permissions_version)
+
+
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=Permission)
+def invalidate_deleted_permissions(sender, **kwargs) -> None:
+    transaction.on_commit(bump_permissions_version)
+
+
+COUNTED_MODELS = {
+    Pizza: "pizza_count",
+    Topping: "topping_count",
+    FeedBack: "feedback_count",
+    PizzaType: "pizza_type_count",
+}
+
+
+@receiver(post_save, sender=Pizza)
+@receiver(post_save, sender=Topping)
+@receiver(post_save, sender=FeedBack)
+@receiver(post_save, sender=PizzaType)
+def increment_counter(sender, instance, created: bool, **kwargs) -> None:
+    if created and not getattr(instance, "is_custom_pizza", False):
+        adjust_counter(COUNTED_MODELS[sender], 1)
+
+
+@receiver(post_delete, sender=Pizza)
+@receiver(post_delete, sender=Topping)
+@receiver(post_delete, sender=FeedBack)
+@receiver(post_delete, sender=PizzaType)
+def decrement_counter(sender, instance, **kwargs) -> None:
+    if not getattr(instance, "is_custom_pizza", False):
+        adjust_counter(COUNTED_MODELS[sender], -1)
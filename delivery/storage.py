@@ -0,0 +1,38 @@
+import os
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+_manifests = {}
+
+
+class PreloadedManifestStaticFilesStorage(
+    CompressedManifestStaticFilesStorage
+):
+    def load_manifest(self) -> dict:
+        path = self.manifest_storage.path(self.manifest_name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return {}
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        if key not in _manifests:
+            _manifests.clear()
+            _manifests[key] = super(
+                PreloadedManifestStaticFilesStorage, self
+            ).load_manifest()
+        return _manifests[key]
+
+    def stored_name(self, name: str) -> str:
+        # Topping images are looked up by name, so a missing file must stay a
+        # 404 for that image rather than a ValueError for the whole page.
+        try:
+            return super(
+                PreloadedManifestStaticFilesStorage, self
+            ).stored_name(name)
+        except ValueError:
+            return name
+
+
+def preload_manifest() -> None:
+    getattr(staticfiles_storage, "hashed_files", None)
@@ -0,0 +1,75 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from delivery.images import get_manifest
+from delivery.models import ImageAsset
+
+register = template.Library()
+
+DEFAULT_SIZES = "100vw"
+SOURCE_TYPES = (("avif", "image/avif"), ("webp", "image/webp"))
+
+
+def srcset(variants: list) -> str:
+    return ", ".join(
+        f"{static(variant['path'])} {variant['width']}w"
+        for variant in variants
+    )
+
+
+@register.simple_tag
+def responsive_image(
+    image,
+    alt: str = "",
+    sizes: str = DEFAULT_SIZES,
+    css_class: str = "",
+    loading: str = "lazy",
+    fallback: str = "",
+) -> str:
+    # Pizzas are only linked to an asset by build_images; until then they
+    # use the old name-based static path.
+    image = image or fallback
+    if not image:
+        return ""
+    name = image.path if isinstance(image, ImageAsset) else image
+    entry = get_manifest().get(name)
+    if entry is None and isinstance(image, ImageAsset):
+        entry = {
+            "fallback": f"assets/img/{name}",
+            "width": image.width,
+            "height": image.height,
+            "placeholder": image.placeholder,
+            "variants": {},
+        }
+    if entry is None:
+        return format_html(
+            '<img src="{}" class="{}" alt="{}" loading="{}" '
+            'decoding="async">',
+            static(f"assets/img/{name}"),
+            css_class,
+            alt,
+            loading,
+        )
+    sources = format_html_join(
+        "",
+        '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (mime_type, srcset(entry["variants"][extension]), sizes)
+            for extension, mime_type in SOURCE_TYPES
+            if entry["variants"].get(extension)
+        ),
+    )
+    return format_html(
+        '<picture>{}<img src="{}" width="{}" height="{}" class="{}" '
+        'alt="{}" loading="{}" decoding="async" '
+        'style="background-color: {}"></picture>',
+        sources,
+        static(entry["fallback"]),
+        entry["width"],
+        entry["height"],
+        css_class,
+        alt,
+        loading,
+        entry.get("placeholder", "transparent"),
+    )
@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from delivery.checkout import checkout
+from delivery.models import (
+    FeedBack,
+    ImageAsset,
+    Order,
+    OrderItem,
+    Pizza,
+    PizzaType,
+    Topping,
+)
+from delivery.pricing import refresh_line_prices
+from delivery.query_budgets import QUERY_BUDGETS
+
+DATASET_SIZES = (2, 12)
+
+
+def seed_dataset(size: int) -> SimpleNamespace:
+    customer = get_user_model().objects.create(
+        username="budget", is_staff=True, is_superuser=True
+    )
+    pizza_type = PizzaType.objects.create(type="Budget")
+    toppings = Topping.objects.bulk_create(
+        Topping(name=f"Topping {i}", price=1) for i in range(size)
+    )
+    images = ImageAsset.objects.bulk_create(
+        ImageAsset(
+            path=f"pizzas/Pizza {i}.png", content_hash="", width=1, height=1
+        )
+        for i in range(size)
+    )
+    pizzas = Pizza.objects.bulk_create(
+        Pizza(
+            name=f"Pizza {i}", price=10, type_pizza=pizza_type, image=image
+        )
+        for i, image in enumerate(images)
+    )
+    Pizza.topping.through.objects.bulk_create(
+        Pizza.topping.through(pizza=pizza, topping=topping)
+        for pizza in pizzas
+        for topping in toppings[:2]
+    )
+    FeedBack.objects.bulk_create(
+        FeedBack(comment=f"Feedback {i}", customer=customer)
+        for i in range(size)
+    )
+    for _ in range(size):
+        add_cart_items(customer, pizzas, toppings)
+        checkout(customer)
+    items = add_cart_items(customer, pizzas, toppings)
+    return SimpleNamespace(
+        customer=customer,
+        pizza_type=pizza_type,
+        pizza=pizzas[0],
+        topping=toppings[0],
+        toppings=toppings,
+        order=items[0].order,
+        item=items[0],
+    )
+
+
+def add_cart_items(customer, pizzas: list, toppings: list) -> list:
+    order = Order.objects.create(customer=customer)
+    items = OrderItem.objects.bulk_create(
+        OrderItem(order=order, pizza=pizza, price=pizza.price, quantity=2)
+        for pizza in pizzas
+    )
+    OrderItem.topping.through.objects.bulk_create(
+        OrderItem.topping.through(orderitem=item, topping=topping)
+        for item in items
+        for topping in toppings[:2]
+    )
+    refresh_line_prices(OrderItem.objects.filter(order=order))
+    return items
+
+
+@pytest.fixture
+def query_budget(db, client):
+    def measure(url_name: str, build_request) -> list:
+        counts = []
+        for size in DATASET_SIZES:
+            with transaction.atomic():
+                dataset = seed_dataset(size)
+                client.force_login(dataset.customer)
+                method, args, data = build_request(dataset)
+                url = reverse(url_name, args=args)
+                cache.clear()
+                with CaptureQueriesContext(connection) as queries:
+                    response = getattr(client, method)(url, data)
+                counts.append(len(queries))
+                assert response.status_code < 400, response.status_code
+                transaction.set_rollback(True)
+        assert counts[0] == counts[-1], (
+            f"{url_name} query count grows with data: {counts}"
+        )
+        assert counts[-1] <= QUERY_BUDGETS[url_name], (
+            f"{url_name} ran {counts[-1]} queries, "
+            f"budget is {QUERY_BUDGETS[url_name]}"
+        )
+        return counts
+
+    return measure
@@ -8,7 +8,8 @@ from delivery.models import (
     Topping,
     Pizza,
     PizzaType,
-    Order
+    Order,
+    OrderItem,
 )
 
 
@@ -91,7 +92,7 @@ class DeliveryAdminTests(TestCase):
         )
 
         order = Order.objects.create(customer=customer)
-        order.pizza.add(pizza)
+        OrderItem.objects.create(order=order, pizza=pizza, price=pizza.price)
         response = self.client.get(
             reverse("admin:delivery_order_change", args=(order.id,))
         )
@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from delivery.auth import CachedModelBackend, user_cache_key
+
+
+@override_settings(
+    SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+    AUTHENTICATION_BACKENDS=["delivery.auth.CachedModelBackend"],
+)
+class CachedModelBackendTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.backend = CachedModelBackend()
+        self.customer = get_user_model().objects.create_user(
+            username="cached", first_name="Old", password="1qazcde3"
+        )
+
+    def test_caches_users(self) -> None:
+        self.backend.get_user(self.customer.pk)
+        with self.assertNumQueries(0):
+            user = self.backend.get_user(self.customer.pk)
+        self.assertEqual(user.first_name, "Old")
+        self.assertIsNone(self.backend.get_user(self.customer.pk + 1))
+
+    def test_save_invalidates(self) -> None:
+        self.backend.get_user(self.customer.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.customer.first_name = "New"
+            self.customer.save()
+        user = self.backend.get_user(self.customer.pk)
+        self.assertEqual(user.first_name, "Old")
+        for callback in callbacks:
+            callback()
+        user = self.backend.get_user(self.customer.pk)
+        self.assertEqual(user.first_name, "New")
+
+    def test_password_change_invalidates(self) -> None:
+        self.client.force_login(self.customer)
+        self.client.get(reverse("delivery:index"))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.customer.set_password("2wsxvfr4")
+            self.customer.save()
+        response = self.client.get(reverse("delivery:order-list"))
+        self.assertEqual(response.status_code, 302)
+
+    def test_logout_invalidates(self) -> None:
+        self.client.force_login(self.customer)
+        self.client.get(reverse("delivery:index"))
+        self.assertIsNotNone(cache.get(user_cache_key(self.customer.pk)))
+        self.client.get(reverse("logout"))
+        self.assertIsNone(cache.get(user_cache_key(self.customer.pk)))
+
+    def test_caches_permissions(self) -> None:
+        self.assertFalse(
+            self.backend.has_perm(self.customer, "delivery.add_pizza")
+        )
+        user = self.backend.get_user(self.customer.pk)
+        with self.assertNumQueries(0):
+            self.assertFalse(
+                self.backend.has_perm(user, "delivery.add_pizza")
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            group = Group.objects.create(name="Cooks")
+            group.permissions.add(
+                Permission.objects.get(codename="add_pizza")
+            )
+            self.customer.groups.add(group)
+        user = self.backend.get_user(self.customer.pk)
+        self.assertTrue(self.backend.has_perm(user, "delivery.add_pizza"))
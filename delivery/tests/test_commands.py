@@ -0,0 +1,258 @@
+import json
+import tempfile
+import time
+import unittest
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+
+from delivery.benchmark import cart_write_load, summarize_writes
+from delivery.counters import get_counters
+from delivery.models import (
+    FeedBack,
+    ImageAsset,
+    PizzaType,
+    Pizza,
+    Order,
+    OrderItem,
+    Receipt,
+    Topping,
+)
+
+
+class RecomputePricesCommandTest(TestCase):
+    def setUp(self) -> None:
+        customer = get_user_model().objects.create_user(username="testuser")
+        pizza_type = PizzaType.objects.create(type="Test Pizza Type")
+        pizza = Pizza.objects.create(
+            name="test", price=10, type_pizza=pizza_type
+        )
+        order = Order.objects.create(customer=customer)
+        OrderItem.objects.bulk_create(
+            OrderItem(order=order, pizza=pizza, price=10, quantity=i + 1)
+            for i in range(5)
+        )
+
+    def test_recompute_prices(self) -> None:
+        out = StringIO()
+        call_command("recompute_prices", chunk_size=2, stdout=out)
+        self.assertIn("Recomputed prices of 5 order items", out.getvalue())
+        for item in OrderItem.objects.all():
+            self.assertEqual(
+                item.price_with_toppings, item.price * item.quantity
+            )
+
+
+class BenchMenuCommandTest(TestCase):
+    def test_bench_menu(self) -> None:
+        out = StringIO()
+        call_command("bench_menu", sizes=[10, 20], repeat=2, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].strip().startswith("10 custom rows"))
+        self.assertEqual(Pizza.objects.count(), 0)
+
+
+class ReconcileCountersCommandTest(TestCase):
+    def test_reconcile_counters(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with override_settings(
+                CACHES={
+                    "default": {
+                        "BACKEND": "django.core.cache.backends.filebased."
+                                   "FileBasedCache",
+                        "LOCATION": cache_dir,
+                    }
+                }
+            ):
+                get_counters()
+                Topping.objects.bulk_create(
+                    Topping(name=f"topping{i}", price=1) for i in range(3)
+                )
+                self.assertEqual(get_counters()["topping_count"], 0)
+                out = StringIO()
+                call_command("reconcile_counters", stdout=out)
+                self.assertIn("topping_count: 3", out.getvalue())
+                self.assertEqual(get_counters()["topping_count"], 3)
+
+    def test_reconcile_counters_requires_shared_cache(self) -> None:
+        with self.assertRaisesMessage(CommandError, "DJANGO_CACHE_BACKEND"):
+            call_command("reconcile_counters", stdout=StringIO())
+
+
+class BenchSearchCommandTest(TestCase):
+    def test_bench_search(self) -> None:
+        out = StringIO()
+        call_command("bench_search", sizes=[10, 20], repeat=2, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].strip().startswith("10 toppings"))
+        self.assertEqual(Topping.objects.count(), 0)
+
+
+class BenchPaginationCommandTest(TestCase):
+    def test_bench_pagination(self) -> None:
+        out = StringIO()
+        call_command("bench_pagination", rows=30, repeat=2, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith("page         1"))
+        self.assertEqual(FeedBack.objects.count(), 0)
+
+
+class FlushFeedbackCommandTest(TestCase):
+    def test_flush_feedback_recovers_spill_files(self) -> None:
+        customer = get_user_model().objects.create_user(username="testuser")
+        with tempfile.TemporaryDirectory() as spill_dir:
+            entry = {
+                "customer_id": customer.id,
+                "comment": "orphan",
+                "created_time": "2023-01-01T00:00:00+00:00",
+            }
+            path = Path(spill_dir) / "feedback-999999.jsonl"
+            path.write_text(json.dumps(entry) + "\n")
+            out = StringIO()
+            with self.settings(FEEDBACK_SPILL_DIR=spill_dir):
+                call_command("flush_feedback", stdout=out)
+        self.assertIn("Flushed 1 feedback entries", out.getvalue())
+        self.assertEqual(FeedBack.objects.get().comment, "orphan")
+
+
+class BenchCommandTest(TestCase):
+    def test_bench_funnel_report(self) -> None:
+        with tempfile.TemporaryDirectory() as output_dir:
+            output = Path(output_dir) / "bench.json"
+            call_command(
+                "bench",
+                customers=2,
+                pizzas=3,
+                toppings=3,
+                orders=5,
+                feedback=5,
+                iterations=2,
+                output=str(output),
+            )
+            report = json.loads(output.read_text())
+        self.assertEqual(report["iterations"], 2)
+        for step in ("menu", "add_pizza", "checkout", "receipt"):
+            self.assertEqual(report["steps"][step]["requests"], 2)
+            self.assertIn("p99_ms", report["steps"][step])
+        self.assertEqual(report["steps"]["checkout"]["status"], {"302": 2})
+        self.assertEqual(Order.objects.count(), 0)
+
+
+class BuildImagesCommandTest(TestCase):
+    def render(self, name: str) -> str:
+        return Template(
+            "{% load responsive_images %}"
+            "{% responsive_image name 'Pizza' '50vw' %}"
+        ).render(Context({"name": name}))
+
+    def test_fallback_without_manifest(self) -> None:
+        with tempfile.TemporaryDirectory() as output_dir:
+            manifest = Path(output_dir) / "manifest.json"
+            with self.settings(IMAGE_MANIFEST=manifest):
+                html = self.render("pizzas/Margherita.png")
+        self.assertIn('src="/static/assets/img/pizzas/Margherita.png"', html)
+        self.assertIn('loading="lazy"', html)
+        self.assertNotIn("<picture>", html)
+
+    def test_asset_without_variants(self) -> None:
+        asset = ImageAsset.objects.create(
+            path="pizzas/Margherita.png",
+            content_hash="abc",
+            width=400,
+            height=300,
+            placeholder="#123456",
+        )
+        with tempfile.TemporaryDirectory() as output_dir:
+            manifest = Path(output_dir) / "manifest.json"
+            with self.settings(IMAGE_MANIFEST=manifest):
+                html = self.render(asset)
+                self.assertEqual(self.render(None), "")
+        self.assertIn('width="400" height="300"', html)
+        self.assertIn("background-color: #123456", html)
+
+    def test_build_images(self) -> None:
+        try:
+            from PIL import Image
+        except ImportError:
+            raise unittest.SkipTest("Pillow is not installed")
+        with tempfile.TemporaryDirectory() as static_dir:
+            source_dir = Path(static_dir) / "img"
+            output_dir = source_dir / "responsive"
+            (source_dir / "pizzas").mkdir(parents=True)
+            Image.new("RGB", (800, 600), "red").save(
+                source_dir / "pizzas" / "Four Cheese.png"
+            )
+            pizza = Pizza.objects.create(
+                name="Four Cheese",
+                price=10,
+                type_pizza=PizzaType.objects.create(type="Test"),
+            )
+            with self.settings(
+                STATICFILES_DIRS=[static_dir],
+                IMAGE_SOURCE_DIR=source_dir,
+                IMAGE_OUTPUT_DIR=output_dir,
+                IMAGE_MANIFEST=output_dir / "manifest.json",
+                IMAGE_WIDTHS=(320, 640, 960),
+            ):
+                out = StringIO()
+                call_command("build_images", stdout=out)
+                self.assertIn(
+                    "Built variants for 1 of 1 images", out.getvalue()
+                )
+                manifest = json.loads(
+                    (output_dir / "manifest.json").read_text()
+                )
+                pizza.refresh_from_db()
+                html = self.render(pizza.image)
+
+                out = StringIO()
+                call_command("build_images", stdout=out)
+                self.assertIn(
+                    "Built variants for 0 of 1 images", out.getvalue()
+                )
+
+        entry = manifest["pizzas/Four Cheese.png"]
+        self.assertRegex(
+            entry["fallback"],
+            r"^img/responsive/pizzas/four-cheese\.\w{12}\.png$",
+        )
+        self.assertEqual((entry["width"], entry["height"]), (800, 600))
+        webp = entry["variants"]["webp"]
+        self.assertEqual([v["width"] for v in webp], [320, 640, 800])
+        self.assertRegex(
+            webp[0]["path"],
+            r"^img/responsive/pizzas/four-cheese-320w\.\w{12}\.webp$",
+        )
+        asset = ImageAsset.objects.get()
+        self.assertEqual(pizza.image, asset)
+        self.assertEqual(asset.path, "pizzas/Four Cheese.png")
+        self.assertEqual(asset.placeholder, "#ff0000")
+        self.assertIn("<picture>", html)
+        self.assertIn('type="image/webp"', html)
+        self.assertIn('sizes="50vw"', html)
+        self.assertIn('width="800" height="600"', html)
+        self.assertIn("background-color: #ff0000", html)
+
+
+class CartWriteLoadTest(TestCase):
+    def test_cart_write_load(self) -> None:
+        customer = get_user_model().objects.create_user(username="writer")
+        pizza_type = PizzaType.objects.create(type="Test Pizza Type")
+        pizza = Pizza.objects.create(
+            name="Test Pizza", price=10, type_pizza=pizza_type
+        )
+        result = cart_write_load(customer, pizza.id, time.time() + 0.3)
+        report = summarize_writes([result, result], duration=0.3)
+        self.assertEqual(report["errors"], 0)
+        self.assertEqual(report["writes"], 2 * len(result["latencies"]))
+        self.assertTrue(
+            Receipt.objects.filter(customer_order__customer=customer).exists()
+        )
@@ -0,0 +1,180 @@
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+
+from django.db import OperationalError, connections
+from django.db.utils import load_backend
+from django.test import SimpleTestCase, TestCase
+
+from delivery import metrics
+from delivery.db.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.dropped = False
+        self.closed = False
+
+    def cursor(self) -> "FakeConnection":
+        return self
+
+    def execute(self, sql: str) -> None:
+        if self.dropped:
+            raise sqlite3.OperationalError("server closed the connection")
+
+    def rollback(self) -> None:
+        self.execute("ROLLBACK")
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    def setUp(self) -> None:
+        metrics.reset()
+
+    def discarded(self, reason: str) -> int:
+        counters = metrics.snapshot()["counters"]
+        key = (("pool", "test"), ("reason", reason))
+        return counters.get("db_pool_discarded_total", {}).get(key, 0)
+
+    def test_reuses_released_connections(self) -> None:
+        pool = ConnectionPool("test", min_size=2)
+        first = pool.acquire(FakeConnection)
+        self.assertEqual((pool.size, len(pool.idle)), (2, 1))
+        pool.release(first)
+        self.assertIs(pool.acquire(FakeConnection), first)
+        histograms = metrics.snapshot()["histograms"]
+        wait = histograms["db_pool_wait_seconds"][(("pool", "test"),)]
+        self.assertEqual(wait["count"], 2)
+
+    def test_waits_for_a_free_connection(self) -> None:
+        pool = ConnectionPool("test", max_size=1, timeout=0.05)
+        connection = pool.acquire(FakeConnection)
+        with self.assertRaises(PoolTimeout):
+            pool.acquire(FakeConnection)
+
+        pool.timeout = 5
+        timer = threading.Timer(0.05, pool.release, [connection])
+        timer.start()
+        self.assertIs(pool.acquire(FakeConnection), connection)
+        timer.join()
+
+    def test_discards_dropped_connections(self) -> None:
+        pool = ConnectionPool("test", check_idle=0)
+        connection = pool.acquire(FakeConnection)
+        pool.release(connection)
+        connection.dropped = True
+        replacement = pool.acquire(FakeConnection)
+        self.assertIsNot(replacement, connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.size, 1)
+        self.assertEqual(self.discarded("failed_check"), 1)
+
+        replacement.dropped = True
+        pool.release(replacement)
+        self.assertEqual((pool.size, len(pool.idle)), (0, 0))
+        self.assertEqual(self.discarded("failed_reset"), 1)
+
+    def test_retires_connections_after_max_lifetime(self) -> None:
+        pool = ConnectionPool("test", max_lifetime=0)
+        connection = pool.acquire(FakeConnection)
+        pool.release(connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(self.discarded("expired"), 1)
+
+
+class PooledSQLiteBackendTest(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_dict = dict(
+            connections["default"].settings_dict,
+            ENGINE="delivery.db.sqlite3",
+            NAME=str(Path(directory.name) / "pool.sqlite3"),
+            POOL={"MAX_SIZE": 2, "CHECK_IDLE": 0},
+        )
+        backend = load_backend(settings_dict["ENGINE"])
+        self.wrappers = [
+            backend.DatabaseWrapper(settings_dict, alias="pooled")
+            for _ in range(2)
+        ]
+        self.pool = self.wrappers[0].pool
+        self.addCleanup(self.pool.close)
+
+    def query(self, wrapper) -> int:
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            return cursor.fetchone()[0]
+
+    def test_connections_return_to_the_pool(self) -> None:
+        first, second = self.wrappers
+        self.assertEqual(self.query(first), 1)
+        raw = first.connection
+        first.close()
+        self.assertEqual(len(self.pool.idle), 1)
+        self.assertEqual(self.query(second), 1)
+        self.assertIs(second.connection, raw)
+        second.close()
+
+    def test_replaces_dropped_connections(self) -> None:
+        first, second = self.wrappers
+        self.query(first)
+        raw = first.connection
+        first.close()
+        raw.close()
+        self.assertEqual(self.query(second), 1)
+        self.assertIsNot(second.connection, raw)
+        self.assertEqual(self.pool.size, 1)
+        second.close()
+
+
+class TunedSQLiteBackendTest(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_dict = dict(
+            connections["default"].settings_dict,
+            ENGINE="delivery.db.sqlite3",
+            NAME=str(Path(directory.name) / "tuned.sqlite3"),
+            PRAGMAS={"busy_timeout": 0},
+        )
+        backend = load_backend(settings_dict["ENGINE"])
+        self.wrappers = [
+            backend.DatabaseWrapper(settings_dict, alias="tuned")
+            for _ in range(2)
+        ]
+        self.addCleanup(self.wrappers[0].pool.close)
+        for wrapper in self.wrappers:
+            self.addCleanup(wrapper.close)
+
+    def pragma(self, wrapper, name: str):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_applies_pragmas(self) -> None:
+        wrapper = self.wrappers[0]
+        self.assertEqual(self.pragma(wrapper, "journal_mode"), "wal")
+        self.assertEqual(self.pragma(wrapper, "synchronous"), 1)
+        self.assertEqual(self.pragma(wrapper, "busy_timeout"), 0)
+        self.assertEqual(self.pragma(wrapper, "cache_size"), -20000)
+
+    def test_transactions_take_the_write_lock_up_front(self) -> None:
+        first, second = self.wrappers
+        with second.cursor() as cursor:
+            cursor.execute("CREATE TABLE cart (id integer)")
+        # What atomic() does on SQLite; BEGIN IMMEDIATE locks before writes.
+        first.set_autocommit(
+            False, force_begin_transaction_with_broken_autocommit=True
+        )
+        try:
+            with self.assertRaisesMessage(
+                OperationalError, "database is locked"
+            ):
+                with second.cursor() as cursor:
+                    cursor.execute("INSERT INTO cart VALUES (1)")
+        finally:
+            first.rollback()
+            first.set_autocommit(True)
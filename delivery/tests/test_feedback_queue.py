@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from delivery import feedback_queue, metrics
+from delivery.counters import get_counters
+from delivery.feedback_queue import FeedbackBuffer, recover_spill_files
+from delivery.models import FeedBack
+
+
+class FeedbackBufferTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        metrics.reset()
+        self.customer = get_user_model().objects.create(username="Test.test")
+        self.spill_dir = tempfile.TemporaryDirectory()
+        self.buffer = FeedbackBuffer(
+            size=3, interval=60, spill_dir=self.spill_dir.name
+        )
+
+    def tearDown(self) -> None:
+        if self.buffer.timer is not None:
+            self.buffer.timer.cancel()
+        if self.buffer.spill is not None:
+            self.buffer.spill.close()
+        self.spill_dir.cleanup()
+
+    def spill_lines(self) -> list:
+        return Path(self.buffer.spill.name).read_text().splitlines()
+
+    def test_flushes_by_size_in_one_insert(self) -> None:
+        get_counters()
+        self.buffer.add(self.customer.id, "first")
+        self.buffer.add(self.customer.id, "second")
+        self.assertEqual(FeedBack.objects.count(), 0)
+        self.assertEqual(len(self.spill_lines()), 2)
+        self.assertEqual(
+            metrics.snapshot()["gauges"]["feedback_queue_depth"][()], 2
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(3):
+                self.buffer.add(self.customer.id, "third")
+        self.assertEqual(FeedBack.objects.count(), 3)
+        self.assertEqual(self.spill_lines(), [])
+        self.assertEqual(get_counters()["feedback_count"], 3)
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["gauges"]["feedback_queue_depth"][()], 0)
+        self.assertEqual(
+            snapshot["histograms"]["feedback_flush_seconds"][()]["count"], 1
+        )
+
+    def test_flush_keeps_created_time(self) -> None:
+        self.buffer.add(self.customer.id, "first")
+        created_time = json.loads(self.spill_lines()[0])["created_time"]
+        self.assertEqual(self.buffer.flush(), 1)
+        feedback = FeedBack.objects.get()
+        self.assertEqual(feedback.created_time.isoformat(), created_time)
+
+    def test_recover_spill_file_of_dead_process(self) -> None:
+        path = Path(self.spill_dir.name) / "feedback-999999.jsonl"
+        entry = {
+            "customer_id": self.customer.id,
+            "comment": "orphan",
+            "created_time": "2023-01-01T00:00:00+00:00",
+        }
+        path.write_text(json.dumps(entry) + "\n{truncated")
+        self.buffer.add(self.customer.id, "pending")
+        self.assertEqual(recover_spill_files(self.spill_dir.name), 1)
+        self.assertFalse(path.exists())
+        self.assertEqual(len(self.spill_lines()), 1)
+        self.assertEqual(FeedBack.objects.get().comment, "orphan")
+
+    def test_reused_pid_keeps_dead_process_entries(self) -> None:
+        path = Path(self.spill_dir.name) / f"feedback-{os.getpid()}.jsonl"
+        entry = {
+            "customer_id": self.customer.id,
+            "comment": "orphan",
+            "created_time": "2023-01-01T00:00:00+00:00",
+        }
+        path.write_text(json.dumps(entry) + "\n")
+        self.buffer.add(self.customer.id, "pending")
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(path.read_text(), json.dumps(entry) + "\n")
+        self.assertEqual(recover_spill_files(self.spill_dir.name), 1)
+        self.assertEqual(
+            sorted(FeedBack.objects.values_list("comment", flat=True)),
+            ["orphan", "pending"],
+        )
+
+    def test_entries_after_flush_survive_a_crash(self) -> None:
+        self.buffer.add(self.customer.id, "flushed")
+        self.assertEqual(self.buffer.flush(), 1)
+        self.buffer.add(self.customer.id, "pending")
+        # The worker dies: its lock goes away, the spill file stays.
+        self.buffer.spill.close()
+        self.buffer.spill = None
+        self.assertEqual(recover_spill_files(self.spill_dir.name), 1)
+        self.assertEqual(
+            sorted(FeedBack.objects.values_list("comment", flat=True)),
+            ["flushed", "pending"],
+        )
+
+
+class FeedbackDropTest(TransactionTestCase):
+    def test_invalid_customer_is_dropped(self) -> None:
+        metrics.reset()
+        customer = get_user_model().objects.create(username="Test.test")
+        with tempfile.TemporaryDirectory() as spill_dir:
+            buffer = FeedbackBuffer(size=3, interval=60, spill_dir=spill_dir)
+            buffer.add(customer.id, "kept")
+            buffer.add(0, "dropped")
+            self.assertEqual(buffer.flush(), 1)
+            buffer.spill.close()
+        self.assertEqual(FeedBack.objects.get().comment, "kept")
+        self.assertEqual(
+            metrics.snapshot()["counters"]["feedback_dropped_total"][()], 1
+        )
+
+
+class FeedbackPostTest(TestCase):
+    def test_post_feedback_is_buffered(self) -> None:
+        customer = get_user_model().objects.create(username="Test.test")
+        self.client.force_login(customer)
+        with tempfile.TemporaryDirectory() as spill_dir:
+            buffer = FeedbackBuffer(size=1, interval=60, spill_dir=spill_dir)
+            with patch.object(feedback_queue, "_buffer", buffer):
+                response = self.client.post(
+                    reverse("delivery:feedback-list"), {"comment": "Tasty"}
+                )
+            buffer.spill.close()
+        self.assertRedirects(response, reverse("delivery:feedback-list"))
+        self.assertEqual(FeedBack.objects.get().comment, "Tasty")
@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from delivery import metrics
+from delivery.middleware import QueryRecorder
+from delivery.models import Order, OrderItem, Pizza, PizzaType
+
+
+class QueryRecorderTest(TestCase):
+    def test_records_duplicate_statements(self) -> None:
+        recorder = QueryRecorder()
+
+        def execute(sql, params, many, context) -> str:
+            return sql
+
+        for sql in ("SELECT 1", "SELECT 2", "SELECT 1", "SELECT 1"):
+            recorder(execute, sql, (), False, {})
+        self.assertEqual(recorder.count, 4)
+        self.assertEqual(recorder.duplicates(), {"SELECT 1": 2})
+
+
+class RequestMetricsMiddlewareTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        metrics.reset()
+        self.customer = get_user_model().objects.create(username="Test.test")
+        pizza_type = PizzaType.objects.create(type="TypeTest")
+        pizza = Pizza.objects.create(
+            name="test", price=10, type_pizza=pizza_type
+        )
+        order = Order.objects.create(customer=self.customer)
+        OrderItem.objects.create(order=order, pizza=pizza, price=10)
+        self.client.force_login(self.customer)
+
+    def test_records_per_view_metrics(self) -> None:
+        self.client.get(reverse("delivery:order-list"))
+        histograms = metrics.snapshot()["histograms"]
+        key = (("view", "delivery:order-list"),)
+        latency = histograms["request_latency_seconds"][key]
+        render_time = histograms["template_render_seconds"][key]
+        self.assertEqual(latency["count"], 1)
+        self.assertEqual(render_time["count"], 1)
+        self.assertGreater(histograms["request_queries"][key]["sum"], 0)
+
+    def test_metrics_endpoint_is_staff_only(self) -> None:
+        url = reverse("delivery:metrics")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+        self.customer.is_staff = True
+        self.customer.save()
+        self.client.get(reverse("delivery:order-list"))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertContains(
+            response, "# TYPE delivery_request_queries histogram"
+        )
+        self.assertContains(
+            response,
+            'delivery_request_queries_bucket{view="delivery:order-list",'
+            'le="+Inf"} 1',
+        )
@@ -1,3 +1,5 @@
+from decimal import Decimal
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 
@@ -7,6 +9,7 @@ from delivery.models import (
     Topping,
     Pizza,
     Order,
+    OrderItem,
     Receipt
 )
 
@@ -96,10 +99,66 @@ class OrderModelTest(TestCase):
             name="Test Pizza", type_pizza=self.pizza_type, price="12.99"
         )
         self.order = Order.objects.create(customer=self.customer)
-        self.order.pizza.add(self.pizza)
+        self.item = OrderItem.objects.create(
+            order=self.order, pizza=self.pizza, price=self.pizza.price
+        )
 
     def test_order_str(self) -> None:
-        self.assertEqual(str(self.order.pizza.first().name), "Test Pizza")
+        self.assertEqual(str(self.order), f"Order #{self.order.pk}")
+        self.assertEqual(self.order.items.first().pizza.name, "Test Pizza")
+
+
+class OrderItemModelTest(TestCase):
+    def setUp(self) -> None:
+        self.customer = get_user_model().objects.create_user(
+            username="testuser",
+        )
+        self.pizza_type = PizzaType.objects.create(type="Test Pizza Type")
+        self.topping = Topping.objects.create(name="Test Topping", price=9.99)
+        self.pizza = Pizza.objects.create(
+            name="Test Pizza", type_pizza=self.pizza_type, price=10.99
+        )
+        self.order = Order.objects.create(customer=self.customer)
+        self.item = OrderItem.objects.create(
+            order=self.order, pizza=self.pizza, price=self.pizza.price
+        )
+        self.item.topping.add(self.topping)
+
+    def test_order_item_str(self) -> None:
+        self.assertEqual(str(self.item), "Test Pizza: 1")
+
+    def test_price_with_toppings_follows_toppings(self) -> None:
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.price_with_toppings, Decimal("20.98"))
+        self.item.topping.remove(self.topping)
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.price_with_toppings, Decimal("10.99"))
+
+    def test_price_with_toppings_follows_quantity(self) -> None:
+        self.item.quantity = 2
+        self.item.save()
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.price_with_toppings, Decimal("31.97"))
+
+    def test_price_with_toppings_follows_topping_price(self) -> None:
+        self.topping.price = 1
+        self.topping.save()
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.price_with_toppings, Decimal("11.99"))
+        self.topping.delete()
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.price_with_toppings, Decimal("10.99"))
+
+    def test_price_with_toppings_follows_topping_clear(self) -> None:
+        self.topping.order_item_topping.clear()
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.price_with_toppings, Decimal("10.99"))
+
+    def test_price_snapshot_ignores_catalog_price(self) -> None:
+        self.pizza.price = 20
+        self.pizza.save()
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.price, Decimal("10.99"))
 
 
 class ReceiptModelTest(TestCase):
@@ -112,7 +171,9 @@ class ReceiptModelTest(TestCase):
             name="test_pizza", price="12", type_pizza=self.pizza_type
         )
         self.order = Order.objects.create(customer=self.customer)
-        self.order.pizza.add(self.pizza)
+        OrderItem.objects.create(
+            order=self.order, pizza=self.pizza, price=self.pizza.price
+        )
         self.receipt = Receipt.objects.create(
             customer_order=self.order,
         )
@@ -0,0 +1,112 @@
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.urls import get_resolver, reverse
+
+from delivery.query_budgets import QUERY_BUDGETS
+from delivery.tests.conftest import seed_dataset
+
+AUTH_MODULES = ("django.contrib.auth", "django.contrib.sessions")
+
+ROUTES = {
+    "delivery:index": lambda data: ("get", [], {}),
+    "delivery:about": lambda data: ("get", [], {}),
+    "delivery:metrics": lambda data: ("get", [], {}),
+    "delivery:search-suggest": lambda data: ("get", [], {"q": "pizza"}),
+    "delivery:pizza-menu-list": lambda data: ("get", [], {}),
+    "delivery:pizza-menu-type-list": lambda data: (
+        "get", [data.pizza_type.id], {}
+    ),
+    "delivery:pizza-update": lambda data: ("get", [data.pizza.id], {}),
+    "delivery:pizza-create": lambda data: ("get", [], {}),
+    "delivery:pizza-delete": lambda data: ("get", [data.pizza.id], {}),
+    "delivery:customer-detail": lambda data: (
+        "get", [data.customer.id], {}
+    ),
+    "delivery:customer-update": lambda data: (
+        "get", [data.customer.id], {}
+    ),
+    "delivery:customer-register": lambda data: ("get", [], {}),
+    "delivery:topping-update": lambda data: ("get", [data.topping.id], {}),
+    "delivery:topping-create": lambda data: ("get", [], {}),
+    "delivery:topping-delete": lambda data: ("get", [data.topping.id], {}),
+    "delivery:topping-list": lambda data: ("get", [], {}),
+    "delivery:order-list": lambda data: ("get", [], {}),
+    "delivery:order-add-pizza": lambda data: ("post", [data.pizza.id], {}),
+    "delivery:order-delete": lambda data: (
+        "post", [data.order.id, data.item.id], {}
+    ),
+    "delivery:order-increment": lambda data: ("post", [data.item.id], {}),
+    "delivery:order-decrement": lambda data: ("post", [data.item.id], {}),
+    "delivery:feedback-list": lambda data: ("get", [], {}),
+    "delivery:receipt-create": lambda data: ("post", [], {}),
+    "delivery:receipt-list": lambda data: ("get", [], {}),
+    "delivery:clean-order": lambda data: ("post", [data.order.id], {}),
+    "delivery:choose-topping": lambda data: (
+        "post",
+        [data.item.id],
+        {"topping": [topping.id for topping in data.toppings[:2]]},
+    ),
+}
+
+
+def delivery_url_names() -> set:
+    resolver = get_resolver()
+    namespace = resolver.namespace_dict["delivery"][1]
+    return {
+        f"delivery:{pattern.name}"
+        for pattern in namespace.url_patterns
+        if pattern.name
+    }
+
+
+def test_every_route_has_a_budget() -> None:
+    assert set(QUERY_BUDGETS) == delivery_url_names()
+    assert set(ROUTES) == set(QUERY_BUDGETS)
+
+
+@pytest.mark.parametrize("url_name", sorted(ROUTES))
+def test_query_budget(query_budget, url_name: str) -> None:
+    query_budget(url_name, ROUTES[url_name])
+
+
+def record_auth_queries(queries: list):
+    def record(execute, sql, params, many, context):
+        # Attribute the query to the first caller outside the ORM.
+        frame = sys._getframe(1)
+        while frame.f_globals["__name__"].startswith("django.db"):
+            frame = frame.f_back
+        if frame.f_globals["__name__"].startswith(AUTH_MODULES):
+            queries.append(sql)
+        return execute(sql, params, many, context)
+
+    return record
+
+
+PAGE_VIEWS = sorted(
+    name for name, route in ROUTES.items() if route(MagicMock())[0] == "get"
+)
+
+
+@pytest.mark.parametrize("url_name", PAGE_VIEWS)
+@override_settings(
+    SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+    AUTHENTICATION_BACKENDS=["delivery.auth.CachedModelBackend"],
+)
+def test_cached_auth_steady_state(db, client, url_name: str) -> None:
+    cache.clear()
+    dataset = seed_dataset(2)
+    dataset.customer.is_superuser = False
+    dataset.customer.save()
+    _, args, data = ROUTES[url_name](dataset)
+    client.force_login(dataset.customer)
+    url = reverse(url_name, args=args)
+    client.get(url, data)
+    queries = []
+    with connection.execute_wrapper(record_auth_queries(queries)):
+        client.get(url, data)
+    assert queries == []
@@ -0,0 +1,99 @@
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from delivery.db.routers import PIN_COOKIE_NAME, ReplicaRouter, replica_view
+from delivery.models import Order, OrderItem, Pizza, PizzaType, Topping
+
+MIDDLEWARE = list(settings.MIDDLEWARE)
+MIDDLEWARE.insert(
+    MIDDLEWARE.index("whitenoise.middleware.WhiteNoiseMiddleware") + 1,
+    "delivery.middleware.ReplicaRoutingMiddleware",
+)
+
+
+@override_settings(
+    DATABASE_REPLICAS=["replica"],
+    DATABASE_ROUTERS=["delivery.db.routers.ReplicaRouter"],
+    MIDDLEWARE=MIDDLEWARE,
+)
+class ReplicaRouterTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.customer = get_user_model().objects.create_user(
+            username="reader"
+        )
+        pizza_type = PizzaType.objects.create(type="Classic")
+        self.pizza = Pizza.objects.create(
+            name="Margarita", price=10, type_pizza=pizza_type
+        )
+        Topping.objects.create(name="Cheese", price=1)
+        self.client.force_login(self.customer)
+        self.replicate()
+        # Written after the snapshot: the replica lags behind the primary.
+        Topping.objects.create(name="Bacon", price=2)
+
+    def replicate(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        name = str(Path(directory.name) / "replica.sqlite3")
+        # backup() blocks on the open test transaction; a dump sees it.
+        replica = sqlite3.connect(name)
+        replica.executescript(
+            "\n".join(connections["default"].connection.iterdump())
+        )
+        replica.close()
+        connections.settings["replica"] = dict(
+            connections["default"].settings_dict, NAME=name
+        )
+        self.addCleanup(connections.settings.pop, "replica")
+        self.addCleanup(connections.__delitem__, "replica")
+        self.addCleanup(connections["replica"].close)
+
+    def test_read_only_views_use_the_replica(self) -> None:
+        response = self.client.get(reverse("delivery:topping-list"))
+        self.assertContains(response, "Cheese")
+        self.assertNotContains(response, "Bacon")
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+
+    def test_other_views_use_the_primary(self) -> None:
+        order = Order.objects.create(customer=self.customer)
+        OrderItem.objects.create(order=order, pizza=self.pizza, price=10)
+        response = self.client.get(reverse("delivery:order-list"))
+        self.assertContains(response, "Margarita")
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+
+    def test_writes_pin_the_client_to_the_primary(self) -> None:
+        response = self.client.post(
+            reverse("delivery:order-add-pizza", args=[self.pizza.id])
+        )
+        self.assertEqual(
+            response.cookies[PIN_COOKIE_NAME]["max-age"],
+            settings.DATABASE_REPLICA_PIN_SECONDS,
+        )
+        response = self.client.get(reverse("delivery:topping-list"))
+        self.assertContains(response, "Bacon")
+
+    def test_menu_snapshot_comes_from_the_primary(self) -> None:
+        Pizza.objects.create(
+            name="Pepperoni", price=12, type_pizza=self.pizza.type_pizza
+        )
+        response = self.client.get(reverse("delivery:pizza-menu-list"))
+        self.assertContains(response, "Pepperoni")
+
+    def test_router(self) -> None:
+        router = ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Topping))
+        self.assertEqual(router.db_for_write(Topping), "default")
+        self.assertFalse(router.allow_migrate("replica", "delivery"))
+        self.assertIsNone(router.allow_migrate("default", "delivery"))
+        self.assertTrue(replica_view("admin:delivery_pizza_changelist"))
+        self.assertFalse(replica_view("admin:delivery_pizza_change"))
+        self.assertFalse(replica_view("delivery:order-list"))
@@ -0,0 +1,97 @@
+import time
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from delivery.models import Pizza, PizzaType, Topping
+from delivery.search import NgramIndex, PrefixIndex, search
+
+
+class NgramIndexTest(TestCase):
+    def setUp(self) -> None:
+        self.index = NgramIndex(
+            [
+                (1, "Double cheese", "Double cheese"),
+                (2, "Cheese", "Cheese"),
+                (3, "Cheesecake crumbs", "Cheesecake crumbs"),
+                (4, "Olives", "Olives"),
+            ]
+        )
+
+    def test_exact_and_prefix_matches_rank_first(self) -> None:
+        self.assertEqual(self.index.search("cheese"), [2, 3, 1])
+
+    def test_short_term_falls_back_to_scan(self) -> None:
+        self.assertEqual(self.index.search("ol"), [4])
+
+    def test_missing_ngram_returns_nothing(self) -> None:
+        self.assertEqual(self.index.search("pepperoni"), [])
+
+
+class SearchTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.pizza_type = PizzaType.objects.create(type="TypeTest")
+        self.topping = Topping.objects.create(name="Mozzarella", price=1)
+
+    def test_search_follows_signals(self) -> None:
+        self.assertEqual(list(search(Topping, "mozz")), [self.topping])
+        with self.captureOnCommitCallbacks() as callbacks:
+            new_topping = Topping.objects.create(
+                name="Buffalo mozzarella", price=2
+            )
+        self.assertEqual(list(search(Topping, "mozz")), [self.topping])
+        for callback in callbacks:
+            callback()
+        self.assertEqual(
+            list(search(Topping, "mozz")), [self.topping, new_topping]
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.topping.delete()
+        self.assertEqual(list(search(Topping, "mozz")), [new_topping])
+
+    @override_settings(CACHE_VERSION_TIMEOUT=60)
+    def test_search_version_expires_in_other_workers(self) -> None:
+        self.assertEqual(list(search(Topping, "mozz")), [self.topping])
+        # Another worker added the topping: its bump never reaches here.
+        with self.captureOnCommitCallbacks():
+            new_topping = Topping.objects.create(
+                name="Buffalo mozzarella", price=2
+            )
+        self.assertEqual(list(search(Topping, "mozz")), [self.topping])
+        with patch("time.time", return_value=time.time() + 61):
+            results = list(search(Topping, "mozz"))
+        self.assertEqual(results, [self.topping, new_topping])
+
+    def test_search_pizzas_by_ingredients(self) -> None:
+        pizza = Pizza.objects.create(
+            name="Margherita",
+            price=10,
+            type_pizza=self.pizza_type,
+            ingredients="tomato, mozzarella, basil",
+        )
+        Pizza.objects.create(
+            name="Basil custom",
+            price=10,
+            type_pizza=self.pizza_type,
+            is_custom_pizza=True,
+        )
+        self.assertEqual(list(search(Pizza, "basil")), [pizza])
+
+
+class PrefixIndexTest(TestCase):
+    def test_suggest_prefix_of_any_word(self) -> None:
+        index = PrefixIndex(
+            [
+                ("topping", 1, "Mozzarella"),
+                ("topping", 2, "Buffalo mozzarella"),
+                ("pizza", 1, "Margherita"),
+            ]
+        )
+        self.assertEqual(
+            [result["name"] for result in index.suggest("mozz")],
+            ["Mozzarella", "Buffalo mozzarella"],
+        )
+        self.assertEqual(index.suggest("m", limit=1)[0]["type"], "pizza")
+        self.assertEqual(index.suggest(""), [])
@@ -0,0 +1,78 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from delivery.models import Topping
+from delivery.storage import PreloadedManifestStaticFilesStorage
+
+STORAGE = "delivery.storage.PreloadedManifestStaticFilesStorage"
+STYLESHEET = ".menu-item { color: #ce1212; font-weight: 600; }\n" * 200
+
+
+class CompressedStaticFilesTest(TestCase):
+    def setUp(self) -> None:
+        self.source_dir = Path(tempfile.mkdtemp())
+        self.static_root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.source_dir)
+        self.addCleanup(shutil.rmtree, self.static_root)
+        (self.source_dir / "assets").mkdir()
+        (self.source_dir / "assets" / "main.css").write_text(STYLESHEET)
+        settings = override_settings(
+            STATICFILES_DIRS=[self.source_dir],
+            STATIC_ROOT=self.static_root,
+            STATICFILES_STORAGE=STORAGE,
+            STATICFILES_FINDERS=[
+                "django.contrib.staticfiles.finders.FileSystemFinder"
+            ],
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        call_command("collectstatic", interactive=False, verbosity=0)
+
+    def test_hashed_files_are_precompressed_and_immutable(self) -> None:
+        url = staticfiles_storage.url("assets/main.css")
+        self.assertRegex(url, r"^/static/assets/main\.[0-9a-f]{12}\.css$")
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING=encoding)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["Content-Encoding"], encoding)
+            self.assertIn("immutable", response["Cache-Control"])
+            self.assertIn("max-age=315360000", response["Cache-Control"])
+            compressed = self.static_root / (url[len("/static/"):] + suffix)
+            self.assertEqual(
+                int(response["Content-Length"]), compressed.stat().st_size
+            )
+            self.assertLess(
+                int(response["Content-Length"]), len(STYLESHEET) / 10
+            )
+            response.close()
+
+    def test_unhashed_files_are_not_immutable(self) -> None:
+        response = self.client.get("/static/assets/main.css")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("immutable", response["Cache-Control"])
+        response.close()
+
+    def test_manifest_is_parsed_once_per_process(self) -> None:
+        first = PreloadedManifestStaticFilesStorage()
+        second = PreloadedManifestStaticFilesStorage()
+        self.assertIn("assets/main.css", first.hashed_files)
+        self.assertIs(first.hashed_files, second.hashed_files)
+
+    def test_missing_files_do_not_break_pages(self) -> None:
+        self.assertEqual(
+            staticfiles_storage.url("topping/New topping.jpeg"),
+            "/static/topping/New topping.jpeg",
+        )
+        Topping.objects.create(name="New topping", price=1)
+        self.client.force_login(
+            get_user_model().objects.create_user(username="static")
+        )
+        response = self.client.get(reverse("delivery:topping-list"))
+        self.assertContains(response, "New topping")
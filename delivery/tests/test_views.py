@@ -1,5 +1,23 @@
+import base64
+import json
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, pre_delete
+from django.test import (
+    Client,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from delivery.forms import CustomerInfoUpdateForm
@@ -8,9 +26,16 @@ from delivery.models import (
     Topping,
     Pizza,
     Order,
+    OrderItem,
     Receipt,
+    ReceiptLine,
     Customer,
+    FeedBack,
 )
+from delivery.checkout import checkout
+from delivery.menu_cache import CSRF_TOKEN_PLACEHOLDER, get_menu_version
+from delivery.pricing import refresh_line_prices
+from delivery.views import add_pizza_to_order
 
 
 class PublicCustomerDetailTest(TestCase):
@@ -135,6 +160,99 @@ class PrivatePizzaMenuTest(TestCase):
         self.assertNotContains(response, self.pizza2.name)
         self.assertTemplateUsed(response, "delivery/pizza_menu.html")
 
+    def test_pizza_without_image_asset_uses_static_path(self) -> None:
+        cache.clear()
+        response = self.client.get(self.url)
+        self.assertContains(
+            response, 'src="/static/assets/img/pizzas/test.png"'
+        )
+
+    def test_pizza_menu_excludes_custom_pizzas(self) -> None:
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        Pizza.objects.bulk_create(
+            Pizza(
+                name="test",
+                price="12",
+                type_pizza=self.pizza_type1,
+                is_custom_pizza=True,
+            )
+            for _ in range(20)
+        )
+        cache.clear()
+        with self.assertNumQueries(len(queries)):
+            response = self.client.get(self.url)
+        self.assertEqual(
+            list(response.context["pizza_menu"]),
+            [self.pizza1, self.pizza2],
+        )
+
+    def test_warm_pizza_menu_skips_menu_queries(self) -> None:
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        menu_tables = ("delivery_pizza", "delivery_topping")
+        self.assertFalse(
+            [
+                query for query in queries
+                if any(table in query["sql"] for table in menu_tables)
+            ]
+        )
+        self.assertContains(response, self.pizza1.name)
+        self.assertContains(response, "csrfmiddlewaretoken")
+        self.assertNotContains(response, CSRF_TOKEN_PLACEHOLDER)
+
+    def test_pizza_menu_cache_invalidation(self) -> None:
+        self.client.get(self.url)
+        version = get_menu_version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.pizza1.name = "renamed"
+            self.pizza1.save()
+            Pizza.objects.create(
+                name="new pizza", price="10", type_pizza=self.pizza_type1
+            )
+            PizzaType.objects.create(type="TypeTest3")
+        self.assertEqual(get_menu_version(), version)
+        for callback in callbacks:
+            callback()
+        response = self.client.get(self.url)
+        self.assertContains(response, "renamed")
+        self.assertContains(response, "new pizza")
+        self.assertContains(response, "TypeTest3")
+
+    @override_settings(CACHE_VERSION_TIMEOUT=60)
+    def test_pizza_menu_version_expires_in_other_workers(self) -> None:
+        cache.clear()
+        self.client.get(self.url)
+        # Another worker saved the pizza: its bump never reaches this cache.
+        with self.captureOnCommitCallbacks():
+            self.pizza1.name = "renamed"
+            self.pizza1.save()
+        self.assertNotContains(self.client.get(self.url), "renamed")
+        later = time.time() + 61
+        with patch("time.time", return_value=later):
+            response = self.client.get(self.url)
+        self.assertContains(response, "renamed")
+
+    def test_pizza_menu_file_based_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with override_settings(
+                CACHES={
+                    "default": {
+                        "BACKEND": "django.core.cache.backends.filebased."
+                                   "FileBasedCache",
+                        "LOCATION": cache_dir,
+                    }
+                }
+            ):
+                self.client.get(self.url)
+                with self.captureOnCommitCallbacks(execute=True):
+                    topping = Topping.objects.create(name="Extra", price=1)
+                    self.pizza1.topping.add(topping)
+                response = self.client.get(self.url)
+        self.assertContains(response, "Extra")
+
 
 class PublicPizzaMenuTest(TestCase):
     def test_login_required(self):
@@ -178,6 +296,20 @@ class PrivateToppingTest(TestCase):
         )
         self.assertTemplateUsed(response, "delivery/topping_list.html")
 
+    def test_topping_list_keyset_pagination(self) -> None:
+        toppings = list(Topping.objects.order_by("price", "id"))
+        toppings += [
+            Topping.objects.create(name=f"Extra {i}", price=5)
+            for i in range(5)
+        ]
+        response = self.client.get(self.url)
+        page_obj = response.context["page_obj"]
+        self.assertEqual(list(page_obj), toppings[:6])
+        response = self.client.get(self.url, {"cursor": page_obj.next_cursor})
+        self.assertEqual(
+            list(response.context["topping_list"]), toppings[6:]
+        )
+
     def test_search_topping_form(self) -> None:
         response = self.client.get(self.url + "?topping=Test_topping1")
         self.assertContains(response, "Test_topping1")
@@ -185,6 +317,49 @@ class PrivateToppingTest(TestCase):
         self.assertTemplateUsed(response, "delivery/topping_list.html")
 
 
+class SearchSuggestTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.customer = get_user_model().objects.create(username="Test.test")
+        pizza_type = PizzaType.objects.create(type="TypeTest")
+        self.pizza = Pizza.objects.create(
+            name="Cheesy", price=10, type_pizza=pizza_type
+        )
+        self.topping = Topping.objects.create(name="Cheese", price=1)
+        self.url = reverse("delivery:search-suggest")
+        self.client.force_login(self.customer)
+
+    def test_suggest_returns_ranked_matches(self) -> None:
+        response = self.client.get(self.url, {"q": "chee"})
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {"type": "topping", "id": self.topping.id, "name": "Cheese"},
+                {"type": "pizza", "id": self.pizza.id, "name": "Cheesy"},
+            ],
+        )
+        self.assertIn("private", response["Cache-Control"])
+
+    def test_suggest_etag(self) -> None:
+        response = self.client.get(self.url, {"q": "chee"})
+        etag = response["ETag"]
+        response = self.client.get(
+            self.url, {"q": "chee"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            Topping.objects.create(name="Cheddar", price=1)
+        response = self.client.get(
+            self.url, {"q": "chee"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_login_required(self) -> None:
+        self.client.logout()
+        response = self.client.get(self.url, {"q": "chee"})
+        self.assertNotEqual(response.status_code, 200)
+
+
 class PublicToppingTest(TestCase):
     def test_login_required(self):
         response = self.client.get(reverse("delivery:topping-list"))
@@ -202,10 +377,10 @@ class PrivateOrderListTest(TestCase):
         self.pizza_type1 = PizzaType.objects.create(type="TypeTest1")
         self.pizza_type2 = PizzaType.objects.create(type="TypeTest2")
         self.pizza1 = Pizza.objects.create(
-            name="test", price=12, type_pizza=self.pizza_type1, quantity=1
+            name="test", price=12, type_pizza=self.pizza_type1
         )
         self.pizza2 = Pizza.objects.create(
-            name="test1", price=12, type_pizza=self.pizza_type2, quantity=2
+            name="test1", price=12, type_pizza=self.pizza_type2
         )
         self.topping1 = Topping.objects.create(
             name="Test_topping1", price=1
@@ -213,11 +388,15 @@ class PrivateOrderListTest(TestCase):
         self.topping2 = Topping.objects.create(
             name="Test_topping2", price=2
         )
-        self.pizza1.topping.add(self.topping1)
-        self.pizza2.topping.add(self.topping2)
         self.order = Order.objects.create(customer=self.customer)
-        self.order.pizza.add(self.pizza1)
-        self.order.pizza.add(self.pizza2)
+        self.item1 = OrderItem.objects.create(
+            order=self.order, pizza=self.pizza1, price=12, quantity=1
+        )
+        self.item2 = OrderItem.objects.create(
+            order=self.order, pizza=self.pizza2, price=12, quantity=2
+        )
+        self.item1.topping.add(self.topping1)
+        self.item2.topping.add(self.topping2)
         self.url = reverse("delivery:order-list")
         self.client.force_login(self.customer)
 
@@ -232,31 +411,223 @@ class PrivateOrderListTest(TestCase):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "delivery/order_list.html")
-        self.assertEqual(response.context["total_price"], 40)
+        self.assertEqual(response.context["total_price"], 39)
+
+    def test_order_list_pizza_without_image_asset(self) -> None:
+        response = self.client.get(self.url)
+        self.assertContains(
+            response, 'src="/static/assets/img/pizzas/test1.png"'
+        )
+
+    def test_order_list_only_shows_own_open_order(self) -> None:
+        other_customer = get_user_model().objects.create(username="other")
+        Order.objects.create(customer=other_customer)
+        Order.objects.create(customer=self.customer, status=True)
+        response = self.client.get(self.url)
+        self.assertEqual(list(response.context["orders"]), [self.order])
 
     def test_clean_order(self) -> None:
-        self.assertEqual(self.order.pizza.count(), 2)
+        self.assertEqual(self.order.items.count(), 2)
         url = reverse("delivery:clean-order", args=[self.order.id])
         response = self.client.post(url)
-        self.assertEqual(self.order.pizza.count(), 0)
+        self.assertEqual(self.order.items.count(), 0)
+        self.assertEqual(Pizza.objects.count(), 2)
         self.assertRedirects(response, "/")
 
+    def test_clean_order_requires_post(self) -> None:
+        url = reverse("delivery:clean-order", args=[self.order.id])
+        self.assertEqual(self.client.get(url).status_code, 405)
+        self.assertEqual(self.order.items.count(), 2)
+
+    def test_clean_order_of_other_customer(self) -> None:
+        other_customer = get_user_model().objects.create(username="other")
+        self.client.force_login(other_customer)
+        url = reverse("delivery:clean-order", args=[self.order.id])
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.order.items.count(), 2)
+
+    def test_delete_pizza_from_other_customer_order(self) -> None:
+        other_customer = get_user_model().objects.create(username="other")
+        self.client.force_login(other_customer)
+        url = reverse(
+            "delivery:order-delete", args=[self.order.id, self.item1.id]
+        )
+        self.client.post(url)
+        self.assertEqual(self.order.items.count(), 2)
+
+    def test_delete_pizza_of_another_order(self) -> None:
+        other_order = Order.objects.create(
+            customer=self.customer, status=True
+        )
+        item = OrderItem.objects.create(
+            order=other_order, pizza=self.pizza1, price=12
+        )
+        url = reverse("delivery:order-delete", args=[self.order.id, item.id])
+        self.client.post(url)
+        self.assertTrue(OrderItem.objects.filter(pk=item.pk).exists())
+        self.assertEqual(self.order.items.count(), 2)
+
+    def test_delete_last_pizza_deletes_order(self) -> None:
+        self.item2.delete()
+        url = reverse(
+            "delivery:order-delete", args=[self.order.id, self.item1.id]
+        )
+        self.client.post(url)
+        self.assertFalse(Order.objects.filter(id=self.order.id).exists())
+        self.assertFalse(OrderItem.topping.through.objects.exists())
+
+    def test_add_pizza_to_order(self) -> None:
+        url = reverse("delivery:order-add-pizza", args=[self.pizza1.id])
+        response = self.client.post(url)
+        self.assertEqual(self.order.items.count(), 3)
+        self.assertEqual(Pizza.objects.count(), 2)
+        self.assertRedirects(response, reverse("delivery:pizza-menu-list"))
+
+    def test_add_pizza_after_concurrent_order_create(self) -> None:
+        get = QuerySet.get
+        raced = []
+
+        def racing_get(queryset, *args, **kwargs):
+            # Another request creates the open order after this lookup.
+            if queryset.model is Order and not raced:
+                raced.append(True)
+                raise Order.DoesNotExist
+            return get(queryset, *args, **kwargs)
+
+        with patch.object(QuerySet, "get", racing_get):
+            item = add_pizza_to_order(self.customer, self.pizza1.id)
+        self.assertEqual(item.order, self.order)
+        self.assertEqual(
+            Order.objects.filter(customer=self.customer, status=False).count(),
+            1,
+        )
+
+    def test_one_open_order_per_customer(self) -> None:
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                Order.objects.create(customer=self.customer)
+        Order.objects.create(customer=self.customer, status=True)
+
+    def test_delete_pizza_from_order(self) -> None:
+        url = reverse(
+            "delivery:order-delete", args=[self.order.id, self.item1.id]
+        )
+        response = self.client.post(url)
+        self.assertEqual(list(self.order.items.all()), [self.item2])
+        self.assertRedirects(response, "/order/")
+
     def test_increment_quantity_pizza_in_order(self) -> None:
-        self.assertEqual(self.pizza1.quantity, 1)
-        url = reverse("delivery:order-increment", args=[self.pizza1.id])
+        self.assertEqual(self.item1.quantity, 1)
+        url = reverse("delivery:order-increment", args=[self.item1.id])
         response = self.client.post(url)
-        updated_pizza = Pizza.objects.get(id=self.pizza1.id)
-        self.assertEqual(updated_pizza.quantity, 2)
+        updated_item = OrderItem.objects.get(id=self.item1.id)
+        self.assertEqual(updated_item.quantity, 2)
         self.assertRedirects(response, "/order/")
 
     def test_decrement_quantity_pizza_in_order(self) -> None:
-        self.assertEqual(self.pizza2.quantity, 2)
-        url = reverse("delivery:order-decrement", args=[self.pizza2.id])
+        self.assertEqual(self.item2.quantity, 2)
+        url = reverse("delivery:order-decrement", args=[self.item2.id])
         response = self.client.post(url)
-        updated_pizza = Pizza.objects.get(id=self.pizza2.id)
-        self.assertEqual(updated_pizza.quantity, 1)
+        updated_item = OrderItem.objects.get(id=self.item2.id)
+        self.assertEqual(updated_item.quantity, 1)
         self.assertRedirects(response, "/order/")
 
+    def test_decrement_keeps_quantity_of_one(self) -> None:
+        url = reverse("delivery:order-decrement", args=[self.item1.id])
+        self.client.post(url)
+        self.item1.refresh_from_db()
+        self.assertEqual(self.item1.quantity, 1)
+        self.assertEqual(self.item1.price_with_toppings, 13)
+
+    def test_quantity_change_json_mode(self) -> None:
+        url = reverse("delivery:order-increment", args=[self.item2.id])
+        response = self.client.post(url, HTTP_ACCEPT="application/json")
+        data = response.json()
+        self.assertEqual(data["id"], self.item2.id)
+        self.assertEqual(data["quantity"], 3)
+        self.assertEqual(Decimal(data["price_with_toppings"]), 38)
+        self.assertEqual(Decimal(data["total_price"]), 51)
+
+    def test_quantity_change_of_other_customer_item(self) -> None:
+        other_customer = get_user_model().objects.create(username="other")
+        self.client.force_login(other_customer)
+        url = reverse("delivery:order-increment", args=[self.item1.id])
+        response = self.client.post(url, HTTP_ACCEPT="application/json")
+        self.assertEqual(response.status_code, 404)
+        self.item1.refresh_from_db()
+        self.assertEqual(self.item1.quantity, 1)
+
+    def test_quantity_change_updates_price_with_toppings(self) -> None:
+        url = reverse("delivery:order-increment", args=[self.item1.id])
+        self.client.post(url)
+        self.item1.refresh_from_db()
+        self.assertEqual(self.item1.price_with_toppings, 25)
+
+    def test_choose_topping_updates_price_with_toppings(self) -> None:
+        url = reverse("delivery:choose-topping", args=[self.item1.id])
+        self.client.post(
+            url, {"topping": [self.topping1.id, self.topping2.id]}
+        )
+        self.item1.refresh_from_db()
+        self.assertEqual(self.item1.price_with_toppings, 15)
+
+    def test_choose_topping_of_other_customer_item(self) -> None:
+        other_customer = get_user_model().objects.create(username="other")
+        self.client.force_login(other_customer)
+        self.item1.refresh_from_db()
+        price = self.item1.price_with_toppings
+        url = reverse("delivery:choose-topping", args=[self.item1.id])
+        response = self.client.post(url, {"topping": [self.topping1.id]})
+        self.assertEqual(response.status_code, 404)
+        self.item1.refresh_from_db()
+        self.assertEqual(self.item1.price_with_toppings, price)
+
+    def test_choose_topping_of_closed_order(self) -> None:
+        Order.objects.filter(pk=self.order.pk).update(status=True)
+        url = reverse("delivery:choose-topping", args=[self.item1.id])
+        response = self.client.post(url, {"topping": [self.topping1.id]})
+        self.assertEqual(response.status_code, 404)
+
+
+class ConcurrentQuantityChangeTest(TransactionTestCase):
+    def setUp(self) -> None:
+        self.customer = get_user_model().objects.create(username="Test.test")
+        pizza_type = PizzaType.objects.create(type="TypeTest")
+        pizza = Pizza.objects.create(
+            name="test", price=10, type_pizza=pizza_type
+        )
+        order = Order.objects.create(customer=self.customer)
+        self.item = OrderItem.objects.create(
+            order=order, pizza=pizza, price=10
+        )
+        self.client.force_login(self.customer)
+
+    def test_parallel_increments_are_not_lost(self) -> None:
+        url = reverse("delivery:order-increment", args=[self.item.id])
+        errors = []
+
+        def click() -> None:
+            client = Client()
+            client.cookies = self.client.cookies
+            try:
+                for _ in range(5):
+                    client.post(url)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=click) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.quantity, 41)
+        self.assertEqual(self.item.price_with_toppings, 410)
+
 
 class PublicOrderListTest(TestCase):
     def test_login_required(self):
@@ -270,6 +641,54 @@ class PublicFeedbackListTest(TestCase):
         self.assertEqual(response.status_code, 200)
 
 
+class FeedbackKeysetPaginationTest(TestCase):
+    def setUp(self) -> None:
+        customer = get_user_model().objects.create(username="Test.test")
+        self.feedback = [
+            FeedBack.objects.create(comment=f"comment {i}", customer=customer)
+            for i in range(7)
+        ]
+        self.feedback.reverse()
+        self.url = reverse("delivery:feedback-list")
+
+    def test_next_and_previous_cursors(self) -> None:
+        response = self.client.get(self.url)
+        page_obj = response.context["page_obj"]
+        self.assertEqual(list(page_obj), self.feedback[:3])
+        self.assertFalse(page_obj.has_previous())
+        response = self.client.get(self.url, {"cursor": page_obj.next_cursor})
+        page_obj = response.context["page_obj"]
+        self.assertEqual(list(page_obj), self.feedback[3:6])
+        response = self.client.get(self.url, {"cursor": page_obj.next_cursor})
+        page_obj = response.context["page_obj"]
+        self.assertEqual(list(page_obj), self.feedback[6:])
+        self.assertFalse(page_obj.has_next())
+        response = self.client.get(
+            self.url, {"cursor": page_obj.previous_cursor}
+        )
+        page_obj = response.context["page_obj"]
+        self.assertEqual(list(page_obj), self.feedback[3:6])
+        self.assertTrue(page_obj.has_previous())
+        self.assertContains(response, "prev")
+        response = self.client.get(
+            self.url, {"cursor": page_obj.previous_cursor}
+        )
+        page_obj = response.context["page_obj"]
+        self.assertEqual(list(page_obj), self.feedback[:3])
+        self.assertFalse(page_obj.has_previous())
+
+    def test_deep_page_costs_the_same_as_first_page(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        first_page_queries = len(queries)
+        cursor = response.context["page_obj"].next_cursor
+        response = self.client.get(self.url, {"cursor": cursor})
+        cursor = response.context["page_obj"].next_cursor
+        with self.assertNumQueries(first_page_queries):
+            self.client.get(self.url, {"cursor": cursor})
+        self.assertFalse([q for q in queries if "COUNT" in q["sql"]])
+
+
 class ReceiptListTest(TestCase):
     def setUp(self) -> None:
         self.customer = get_user_model().objects.create(
@@ -292,12 +711,16 @@ class ReceiptListTest(TestCase):
         self.topping2 = Topping.objects.create(
             name="Test_topping2", price=2
         )
-        self.pizza1.topping.add(self.topping1)
-        self.pizza2.topping.add(self.topping2)
         self.order = Order.objects.create(customer=self.customer)
-        self.order.pizza.add(self.pizza1)
-        self.order.pizza.add(self.pizza2)
-        self.receipt1 = Receipt.objects.create(customer_order=self.order)
+        item1 = OrderItem.objects.create(
+            order=self.order, pizza=self.pizza1, price=12
+        )
+        item2 = OrderItem.objects.create(
+            order=self.order, pizza=self.pizza2, price=12
+        )
+        item1.topping.add(self.topping1)
+        item2.topping.add(self.topping2)
+        self.receipt1 = checkout(self.customer)
         self.url = reverse("delivery:receipt-list")
         self.client.force_login(self.customer)
 
@@ -305,12 +728,303 @@ class ReceiptListTest(TestCase):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "delivery/receipt_list.html")
-        self.assertEqual(response.context["total_price"], 28)
+        self.assertEqual(response.context["total_price"], 27)
         self.assertEqual(response.context["topping_total_price"], 3)
 
+    def test_receipt_list_only_shows_own_receipts(self) -> None:
+        other_customer = get_user_model().objects.create(username="other")
+        other_order = Order.objects.create(customer=other_customer)
+        Receipt.objects.create(customer_order=other_order)
+        response = self.client.get(self.url)
+        self.assertEqual(
+            list(response.context["receipt_order"]), [self.receipt1]
+        )
+
+    def test_receipt_list_keyset_pagination(self) -> None:
+        receipts = [self.receipt1] + [
+            Receipt.objects.create(customer_order=self.order)
+            for _ in range(11)
+        ]
+        receipts.reverse()
+        response = self.client.get(self.url)
+        page_obj = response.context["page_obj"]
+        self.assertEqual(
+            list(response.context["receipt_order"]), receipts[:10]
+        )
+        self.assertTrue(page_obj.has_next())
+        response = self.client.get(
+            self.url, {"cursor": page_obj.next_cursor}
+        )
+        self.assertEqual(
+            list(response.context["receipt_order"]), receipts[10:]
+        )
+        self.assertFalse(response.context["page_obj"].has_next())
+
+    def test_receipt_list_invalid_cursor(self) -> None:
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+        for values in ([">", None, None], [">", 5, 1], [">", {}, 1]):
+            cursor = base64.urlsafe_b64encode(json.dumps(values).encode())
+            for url in (self.url, reverse("delivery:feedback-list")):
+                response = self.client.get(url, {"cursor": cursor.decode()})
+                self.assertEqual(response.status_code, 404, values)
+
     def test_create_receipt(self) -> None:
         self.assertEqual(Receipt.objects.all().count(), 1)
+        order = Order.objects.create(customer=self.customer)
+        OrderItem.objects.create(order=order, pizza=self.pizza1, price=12)
         url = reverse("delivery:receipt-create")
         response = self.client.post(url)
         self.assertRedirects(response, "/receipt/")
         self.assertEqual(Receipt.objects.all().count(), 2)
+        order.refresh_from_db()
+        self.assertTrue(order.status)
+
+    def test_create_receipt_requires_post(self) -> None:
+        order = Order.objects.create(customer=self.customer)
+        OrderItem.objects.create(order=order, pizza=self.pizza1, price=12)
+        url = reverse("delivery:receipt-create")
+        self.assertEqual(self.client.get(url).status_code, 405)
+        self.client.logout()
+        response = self.client.post(url)
+        self.assertRedirects(
+            response,
+            f"{reverse('login')}?next={url}",
+            fetch_redirect_response=False,
+        )
+        order.refresh_from_db()
+        self.assertFalse(order.status)
+
+    def test_create_receipt_without_open_order(self) -> None:
+        response = self.client.post(reverse("delivery:receipt-create"))
+        self.assertRedirects(response, "/receipt/")
+        self.assertEqual(Receipt.objects.all().count(), 1)
+
+    def test_receipt_snapshot_survives_price_changes(self) -> None:
+        self.topping1.price = 10
+        self.topping1.save()
+        self.pizza1.price = 100
+        self.pizza1.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["total_price"], 27)
+        self.assertContains(response, "Test_topping1")
+        line = self.receipt1.lines.get(pizza_name="test")
+        self.assertEqual(line.price_with_toppings, 13)
+        self.assertEqual(line.toppings[0]["name"], "Test_topping1")
+
+    def test_checkout_writes_lines_in_one_batch(self) -> None:
+        order = Order.objects.create(customer=self.customer)
+        items = OrderItem.objects.bulk_create(
+            OrderItem(order=order, pizza=self.pizza1, price=12)
+            for _ in range(20)
+        )
+        with CaptureQueriesContext(connection) as queries:
+            receipt = checkout(self.customer)
+        inserts = [
+            q for q in queries
+            if q["sql"].startswith('INSERT INTO "delivery_receiptline"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(receipt.lines.count(), len(items))
+
+
+class TotalPriceQueryCountTest(TestCase):
+    def setUp(self) -> None:
+        self.customer = get_user_model().objects.create(
+            username="Test.test",
+            phone_number="+380754672345",
+            address="Test, 1, 234",
+            email="test@gmail.com",
+        )
+        pizza_type = PizzaType.objects.create(type="TypeTest")
+        self.pizza = Pizza.objects.create(
+            name="test", price=10, type_pizza=pizza_type
+        )
+        self.topping = Topping.objects.create(name="Test_topping", price=1)
+        self.order = Order.objects.create(customer=self.customer)
+        self.client.force_login(self.customer)
+
+    def add_line_items(self, count: int) -> None:
+        items = OrderItem.objects.bulk_create(
+            OrderItem(order=self.order, pizza=self.pizza, price=10, quantity=2)
+            for _ in range(count)
+        )
+        OrderItem.topping.through.objects.bulk_create(
+            OrderItem.topping.through(orderitem=item, topping=self.topping)
+            for item in items
+        )
+        refresh_line_prices(OrderItem.objects.all())
+
+    def add_receipt_lines(self, count: int) -> None:
+        ReceiptLine.objects.bulk_create(
+            ReceiptLine(
+                receipt=self.receipt,
+                pizza_name="test",
+                price=10,
+                toppings=[{"name": "Test_topping", "price": "1"}],
+                topping_price=1,
+                quantity=2,
+                price_with_toppings=21,
+            )
+            for _ in range(count)
+        )
+        Receipt.objects.filter(pk=self.receipt.pk).update(
+            total_price=21 * self.receipt.lines.count()
+        )
+
+    def assert_constant_queries(self, url: str, add_lines) -> None:
+        query_counts = []
+        line_items = 0
+        for size in (1, 50, 500):
+            add_lines(size - line_items)
+            line_items = size
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.context["total_price"], 21 * size)
+            self.assertFalse(
+                [q for q in queries if q["sql"].startswith("UPDATE")]
+            )
+            query_counts.append(len(queries))
+        self.assertEqual(len(set(query_counts)), 1, query_counts)
+
+    def test_order_list_query_count(self) -> None:
+        self.assert_constant_queries(
+            reverse("delivery:order-list"), self.add_line_items
+        )
+
+    def test_receipt_list_query_count(self) -> None:
+        self.receipt = Receipt.objects.create(customer_order=self.order)
+        self.assert_constant_queries(
+            reverse("delivery:receipt-list"), self.add_receipt_lines
+        )
+
+
+class OrderCleanupQueryCountTest(TestCase):
+    def setUp(self) -> None:
+        self.customer = get_user_model().objects.create(
+            username="Test.test",
+            phone_number="+380754672345",
+            address="Test, 1, 234",
+            email="test@gmail.com",
+        )
+        pizza_type = PizzaType.objects.create(type="TypeTest")
+        self.pizza = Pizza.objects.create(
+            name="test", price=10, type_pizza=pizza_type
+        )
+        self.topping = Topping.objects.create(name="Test_topping", price=1)
+        self.client.force_login(self.customer)
+
+    def create_order(self, size: int) -> Order:
+        order = Order.objects.create(customer=self.customer)
+        items = OrderItem.objects.bulk_create(
+            OrderItem(order=order, pizza=self.pizza, price=10)
+            for _ in range(size)
+        )
+        OrderItem.topping.through.objects.bulk_create(
+            OrderItem.topping.through(orderitem=item, topping=self.topping)
+            for item in items
+        )
+        return order
+
+    def test_clean_order_query_count(self) -> None:
+        query_counts = []
+        for size in (1, 50, 500):
+            order = self.create_order(size)
+            Receipt.objects.create(customer_order=order)
+            url = reverse("delivery:clean-order", args=[order.id])
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(url)
+            query_counts.append(len(queries))
+            self.assertFalse(Order.objects.exists())
+            self.assertFalse(OrderItem.topping.through.objects.exists())
+        self.assertEqual(len(set(query_counts)), 1, query_counts)
+
+    def test_order_items_only_cascade_to_toppings(self) -> None:
+        # delete_order_items skips the collector; a new reverse relation or
+        # delete receiver on OrderItem must go through delete() instead.
+        relations = [
+            field.related_model
+            for field in OrderItem._meta.get_fields(include_hidden=True)
+            if field.auto_created and not field.concrete
+        ]
+        self.assertEqual(relations, [OrderItem.topping.through])
+        self.assertFalse(pre_delete.has_listeners(OrderItem))
+        self.assertFalse(post_delete.has_listeners(OrderItem))
+
+    def test_delete_item_query_count(self) -> None:
+        query_counts = []
+        for size in (2, 50, 500):
+            order = self.create_order(size)
+            item = order.items.first()
+            url = reverse("delivery:order-delete", args=[order.id, item.id])
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(url)
+            query_counts.append(len(queries))
+            self.assertEqual(order.items.count(), size - 1)
+            order.delete()
+        self.assertEqual(len(set(query_counts)), 1, query_counts)
+
+
+class IndexTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.pizza_type = PizzaType.objects.create(type="TypeTest")
+        Pizza.objects.create(
+            name="test", price="12", type_pizza=self.pizza_type
+        )
+        self.url = reverse("delivery:index")
+
+    def test_index_counters(self) -> None:
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["pizza_count"], 1)
+        self.assertEqual(response.context["pizza_type_count"], 1)
+        self.assertEqual(response.context["topping_count"], 0)
+        self.assertEqual(response.context["feedback_count"], 0)
+
+    def test_index_warm_render_without_queries(self) -> None:
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("Cookie", response["Vary"])
+
+    def test_index_counters_follow_signals(self) -> None:
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Topping.objects.create(name="Test_topping", price=1)
+            Pizza.objects.create(
+                name="custom",
+                price="12",
+                type_pizza=self.pizza_type,
+                is_custom_pizza=True,
+            )
+            self.pizza_type.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["pizza_count"], 0)
+        self.assertEqual(response.context["pizza_type_count"], 0)
+        self.assertEqual(response.context["topping_count"], 1)
+
+    def test_index_counters_ignore_rolled_back_writes(self) -> None:
+        self.client.get(self.url)
+        with transaction.atomic():
+            Topping.objects.create(name="Test_topping", price=1)
+            transaction.set_rollback(True)
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["topping_count"], 0)
+
+    @override_settings(CACHE_VERSION_TIMEOUT=60)
+    def test_index_counters_expire_in_other_workers(self) -> None:
+        self.client.get(self.url)
+        # Created in another worker: its increment stays in that cache.
+        with self.captureOnCommitCallbacks():
+            Topping.objects.create(name="Test_topping", price=1)
+        with patch("time.time", return_value=time.time() + 61):
+            response = self.client.get(self.url)
+        self.assertEqual(response.context["topping_count"], 1)
+
+    def test_index_private_for_authenticated_customer(self) -> None:
+        customer = get_user_model().objects.create(username="Test.test")
+        self.client.force_login(customer)
+        response = self.client.get(self.url)
+        self.assertIn("private", response["Cache-Control"])
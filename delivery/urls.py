@@ -24,11 +24,15 @@ from delivery.views import (
     ReceiptListView,
     clean_order,
     ChooseToppingView,
+    search_suggest,
+    prometheus_metrics,
 )
 
 urlpatterns = [
     path("", index, name="index"),
     path("about/", about, name="about"),
+    path("metrics", prometheus_metrics, name="metrics"),
+    path("api/search/suggest", search_suggest, name="search-suggest"),
     path("menu/", PizzaMenuListView.as_view(), name="pizza-menu-list"),
     path(
         "menu/type/<int:type_id>/",
@@ -97,7 +101,7 @@ urlpatterns = [
     ),
 
     path(
-        "order-delete/<int:order_id>/<int:pizza_id>/",
+        "order-delete/<int:order_id>/<int:item_id>/",
         OrderDeleteView.as_view(),
         name="order-delete",
     ),
@@ -11,6 +11,9 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from delivery.storage import preload_manifest
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "delivery_pizza.settings")
 
 application = get_asgi_application()
+preload_manifest()
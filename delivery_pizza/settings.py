@@ -47,14 +47,13 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "crispy_forms",
-    "debug_toolbar",
     "delivery",
 ]
 
 MIDDLEWARE = [
+    "delivery.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -63,6 +62,13 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+if DEBUG:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("whitenoise.middleware.WhiteNoiseMiddleware") + 1,
+        "debug_toolbar.middleware.DebugToolbarMiddleware",
+    )
+
 ROOT_URLCONF = "delivery_pizza.urls"
 
 TEMPLATES = [
@@ -98,10 +104,121 @@ DATABASES = {
 db_from_env = dj_database_url.config(conn_max_age=500)
 DATABASES["default"].update(db_from_env)
 
+# Read replicas (delivery/db/routers.py), as comma-separated database
+# URLs. Tests mirror them onto the default test database.
+DATABASE_REPLICAS = []
+for index, url in enumerate(
+    filter(None, os.getenv("DJANGO_DB_REPLICA_URLS", "").split(","))
+):
+    alias = f"replica{index + 1}"
+    DATABASES[alias] = dj_database_url.parse(url.strip(), conn_max_age=500)
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(alias)
+
+# Seconds a client keeps reading from the primary after it writes.
+DATABASE_REPLICA_PIN_SECONDS = int(
+    os.getenv("DJANGO_DB_REPLICA_PIN_SECONDS", 10)
+)
+
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ["delivery.db.routers.ReplicaRouter"]
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("whitenoise.middleware.WhiteNoiseMiddleware") + 1,
+        "delivery.middleware.ReplicaRoutingMiddleware",
+    )
+
+# Per-process connection pool (delivery/db/pool.py). Connections go back
+# to the pool when Django closes them after each request.
+if os.getenv("DJANGO_DB_POOL") == "True":
+    for database in DATABASES.values():
+        if database["ENGINE"] != "django.db.backends.postgresql":
+            continue
+        database.update(
+            ENGINE="delivery.db.postgresql",
+            CONN_MAX_AGE=0,
+            POOL={
+                "MIN_SIZE": int(os.getenv("DJANGO_DB_POOL_MIN_SIZE", 0)),
+                "MAX_SIZE": int(os.getenv("DJANGO_DB_POOL_MAX_SIZE", 10)),
+                "MAX_LIFETIME": float(
+                    os.getenv("DJANGO_DB_POOL_MAX_LIFETIME", 30 * 60)
+                ),
+                "TIMEOUT": float(os.getenv("DJANGO_DB_POOL_TIMEOUT", 10)),
+                "CHECK_IDLE": float(
+                    os.getenv("DJANGO_DB_POOL_CHECK_IDLE", 30)
+                ),
+            },
+        )
+
+# SQLite production profile (delivery/db/sqlite3/base.py): WAL, tuned
+# pragmas and BEGIN IMMEDIATE, with connections kept in the pool so the
+# pragmas run once per connection rather than once per request.
+if os.getenv("DJANGO_SQLITE_TUNED") == "True":
+    for database in DATABASES.values():
+        if database["ENGINE"] != "django.db.backends.sqlite3":
+            continue
+        database.update(
+            ENGINE="delivery.db.sqlite3",
+            CONN_MAX_AGE=0,
+            POOL={"MAX_SIZE": int(os.getenv("DJANGO_DB_POOL_MAX_SIZE", 10))},
+            PRAGMAS={
+                "busy_timeout": int(
+                    os.getenv("DJANGO_SQLITE_BUSY_TIMEOUT", 5000)
+                )
+            },
+        )
+
 # test database
 if "test" in sys.argv or "test_coverage" in sys.argv:
     DATABASES["default"]["ENGINE"] = "django.db.backends.sqlite3"
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "DJANGO_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.getenv("DJANGO_CACHE_LOCATION", "delivery-pizza"),
+    }
+}
+
+# The menu and search indexes are versioned through keys in this cache,
+# and the home page counters live in it. LocMem is per process, so a bump
+# or counter update only reaches the worker that handled the write; there
+# these keys expire after a minute so the other workers catch up. Shared
+# backends keep them until the next update, and reconcile_counters needs
+# one.
+CACHE_VERSION_TIMEOUT = int(
+    os.getenv(
+        "DJANGO_CACHE_VERSION_TIMEOUT",
+        60 if CACHES["default"]["BACKEND"].endswith(".LocMemCache") else 0,
+    )
+) or None
+
+# Cached sessions and users (delivery/auth.py): logged-in requests skip the
+# session and Customer SELECTs. Logout and user edits are invalidated in
+# this process's cache only, so use a shared DJANGO_CACHE_BACKEND when
+# running more than one worker.
+if os.getenv("DJANGO_AUTH_CACHE") == "True":
+    SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+    AUTHENTICATION_BACKENDS = [
+        "delivery.auth.CachedModelBackend",
+        # Keeps sessions created before the switch logged in.
+        "django.contrib.auth.backends.ModelBackend",
+    ]
+
+# Feedback write-behind buffer
+
+FEEDBACK_BUFFER_SIZE = int(os.getenv("DJANGO_FEEDBACK_BUFFER_SIZE", 50))
+FEEDBACK_FLUSH_INTERVAL = float(
+    os.getenv("DJANGO_FEEDBACK_FLUSH_INTERVAL", 2)
+)
+FEEDBACK_SPILL_DIR = os.getenv(
+    "DJANGO_FEEDBACK_SPILL_DIR", BASE_DIR / "var" / "feedback"
+)
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -148,6 +265,19 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = "staticfiles/"
 
+if not DEBUG:
+    STATICFILES_STORAGE = (
+        "delivery.storage.PreloadedManifestStaticFilesStorage"
+    )
+
+# Responsive image variants built by `manage.py build_images`
+
+IMAGE_SOURCE_DIR = BASE_DIR / "static" / "assets" / "img"
+IMAGE_OUTPUT_DIR = IMAGE_SOURCE_DIR / "responsive"
+IMAGE_MANIFEST = IMAGE_OUTPUT_DIR / "manifest.json"
+IMAGE_WIDTHS = (320, 640, 960)
+IMAGE_QUALITY = 70
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
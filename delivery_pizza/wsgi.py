@@ -11,6 +11,9 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from delivery.storage import preload_manifest
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "delivery_pizza.settings")
 
 application = get_wsgi_application()
+preload_manifest()
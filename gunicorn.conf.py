@@ -0,0 +1,3 @@
+# Import the app (and its static manifest) once in the master so workers
+# share the parsed manifest copy-on-write instead of each re-reading it.
+preload_app = True
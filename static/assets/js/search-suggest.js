@@ -0,0 +1,46 @@
+document.addEventListener('DOMContentLoaded', () => {
+  "use strict";
+
+  /**
+   * Search suggestions
+   */
+  const form = document.querySelector('form[data-suggest-url]');
+  if (!form) return;
+
+  const input = form.querySelector('input[list]');
+  const datalist = document.getElementById(input.getAttribute('list'));
+  let controller = null;
+  let timer = null;
+
+  function showSuggestions(results) {
+    datalist.replaceChildren(...results.map(result => {
+      const option = document.createElement('option');
+      option.value = result.name;
+      option.label = result.type;
+      return option;
+    }));
+  }
+
+  function fetchSuggestions() {
+    const term = input.value.trim();
+    if (controller) controller.abort();
+    if (!term) {
+      showSuggestions([]);
+      return;
+    }
+    controller = new AbortController();
+    const url = form.dataset.suggestUrl + '?q=' + encodeURIComponent(term);
+    fetch(url, {
+      headers: {'Accept': 'application/json'},
+      signal: controller.signal
+    })
+      .then(response => response.json())
+      .then(data => showSuggestions(data.results))
+      .catch(() => {});
+  }
+
+  input.addEventListener('input', () => {
+    clearTimeout(timer);
+    timer = setTimeout(fetchSuggestions, 150);
+  });
+});